@@ -1,7 +1,16 @@
-import pandas as pd
-import re
+import argparse
+import json
+import multiprocessing as mp
 import os
-import glob
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# tidal.py (store biner pasang surut) ada di folder JSSP-CAOA-SSR
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tidal import TidalStore, NS_PER_HOUR
 
 def check_timestamp_format(ts):
     if pd.isna(ts):
@@ -113,14 +122,144 @@ def process_tidal_csv(file_path):
     return summary_df, invalid_rows
 
 # ==========================================
-# EKSEKUSI PIPELINE UNTUK SEMUA 17 FILE CSV
+# VALIDATOR SEMUA PELABUHAN (STORE BINER + PROCESS POOL)
+# ==========================================
+# Semua cek berupa operasi array atas deret dari TidalStore (tanpa .apply per baris).
+# Sampel per jam memakai konvensi hour-ending: sampel 01:00 mewakili jam 00:00-01:00,
+# sehingga sampel '24:00:00' (= 00:00 hari berikutnya) tetap dihitung ke hari/bulan asalnya.
+
+MAX_LISTED = 50 # batas jumlah contoh gap/duplikat yang dicantumkan per pelabuhan
+GAP_TOLERANCE_NS = 65 * 60 * 10**9 # selisih > 65 menit = ada jam yang hilang
+
+def _fmt(ns_values):
+    return [str(v) for v in np.asarray(ns_values, dtype=np.int64).view('datetime64[ns]').astype('datetime64[s]')]
+
+def validate_port(task):
+    store_dir, tidal_dir, port = task
+    store = TidalStore(tidal_dir, store_dir, refresh=False)
+    info = store.info(port)
+    times, elevation = store.series(port)
+
+    # 1. Format timestamp (regex vektor saat ingest) & baris yang gagal diparse
+    invalid_rows = info['invalid_rows']
+    unparsed = [row for row in invalid_rows if not row[2]]
+
+    # 2. Gap & duplikat dari selisih waktu berurutan
+    diff = np.diff(times)
+    gap_idx = np.flatnonzero(diff > GAP_TOLERANCE_NS)
+    dup_idx = np.flatnonzero(diff == 0)
+    # Timestamp yang tidak tepat di jam bulat (mis. 02:00:07)
+    off_grid_idx = np.flatnonzero(times % NS_PER_HOUR != 0)
+
+    # 3. Cakupan per bulan (jam yang terisi vs jam kalender)
+    period = (times - NS_PER_HOUR).view('datetime64[ns]')
+    months, month_hours = np.unique(period.astype('datetime64[M]'), return_counts=True)
+    day_months = np.unique(period.astype('datetime64[D]')).astype('datetime64[M]')
+    _, month_days = np.unique(day_months, return_counts=True)
+    calendar_hours = ((months + 1).astype('datetime64[h]') - months.astype('datetime64[h]')).astype(np.int64)
+    coverage = [
+        {'month': str(m), 'days': int(d), 'hours': int(h), 'expected_hours': int(e),
+         'coverage': round(float(h) / float(e), 4)}
+        for m, d, h, e in zip(months, month_days, month_hours, calendar_hours)
+    ]
+    incomplete = [c['month'] for c in coverage if c['hours'] != c['expected_hours']]
+
+    elevation = np.asarray(elevation)
+    n_nan = int(np.isnan(elevation).sum())
+    failed = invalid_rows or len(gap_idx) or len(dup_idx) or incomplete or n_nan
+    status = 'FAIL' if failed else ('WARN' if len(off_grid_idx) else 'OK')
+    return {
+        'port': port,
+        'source': info['source'],
+        'status': status,
+        'rows': int(len(times)),
+        'first': _fmt(times[:1])[0] if len(times) else None,
+        'last': _fmt(times[-1:])[0] if len(times) else None,
+        'invalid_format': len(invalid_rows),
+        'unparsed': len(unparsed),
+        'gaps': int(len(gap_idx)),
+        'missing_hours': int((np.round(diff[gap_idx] / NS_PER_HOUR) - 1).sum()),
+        'duplicates': int(len(dup_idx)),
+        'off_grid': int(len(off_grid_idx)),
+        'nan_elevation': n_nan,
+        'elevation_min': round(float(np.nanmin(elevation)), 4) if len(elevation) else None,
+        'elevation_max': round(float(np.nanmax(elevation)), 4) if len(elevation) else None,
+        'months_incomplete': incomplete,
+        'invalid_rows': invalid_rows[:MAX_LISTED],
+        'gap_list': [
+            {'from': a, 'to': b, 'hours': float(h)}
+            for a, b, h in zip(_fmt(times[gap_idx[:MAX_LISTED]]),
+                               _fmt(times[gap_idx[:MAX_LISTED] + 1]),
+                               diff[gap_idx[:MAX_LISTED]] / NS_PER_HOUR)
+        ],
+        'duplicate_list': _fmt(times[dup_idx[:MAX_LISTED]]),
+        'off_grid_list': _fmt(times[off_grid_idx[:MAX_LISTED]]),
+        'monthly': coverage
+    }
+
+def validate_all(tidal_dir, store_dir=None, workers=None, ports=None):
+    # Ingest inkremental sekali di proses utama, lalu cek per pelabuhan di process pool
+    store = TidalStore(tidal_dir, store_dir)
+    ports = [p for p in store.ports if ports is None or p in ports]
+    tasks = [(store.store_dir, tidal_dir, port) for port in ports]
+    workers = min(workers or mp.cpu_count(), max(len(tasks), 1))
+    if workers > 1:
+        with mp.Pool(workers) as pool:
+            results = pool.map(validate_port, tasks)
+    else:
+        results = [validate_port(task) for task in tasks]
+    return results, store.ingested
+
+SUMMARY_COLUMNS = ['port', 'status', 'rows', 'first', 'last', 'invalid_format', 'unparsed',
+                   'gaps', 'missing_hours', 'duplicates', 'off_grid', 'nan_elevation',
+                   'elevation_min', 'elevation_max', 'months_incomplete']
+
+def write_report(results, out_path, meta=None):
+    # .json = laporan lengkap; .csv = satu baris ringkasan per pelabuhan
+    if out_path.endswith('.csv'):
+        summary = pd.DataFrame(results)[SUMMARY_COLUMNS]
+        summary['months_incomplete'] = summary['months_incomplete'].str.join(';')
+        summary.to_csv(out_path, index=False)
+        return
+    with open(out_path, 'w') as f:
+        json.dump({**(meta or {}), 'ports': results}, f, indent=1)
+
+# ==========================================
+# EKSEKUSI PIPELINE UNTUK SEMUA FILE CSV
 # ==========================================
 if __name__ == "__main__":
-    folder_path = "./JSSP-CAOA-SSR/Data/Tidal/WAINGAPU.csv"
-    all_files = glob.glob(folder_path)
-    
-    if not all_files:
+    parser = argparse.ArgumentParser(description="Validasi data pasang surut semua pelabuhan")
+    parser.add_argument("--tidal-dir", default="./JSSP-CAOA-SSR/Data/Tidal")
+    parser.add_argument("--store-dir", default=None, help="Default: <tidal-dir>/.cache/store")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--ports", nargs='+', default=None, help="Subset pelabuhan (default semua)")
+    parser.add_argument("--out", default="tidal_validation.json",
+                        help="Laporan: .json (lengkap) atau .csv (ringkasan per pelabuhan)")
+    args = parser.parse_args()
+
+    start = time.time()
+    results, ingested = validate_all(args.tidal_dir, args.store_dir, args.workers,
+                                     [p.upper() for p in args.ports] if args.ports else None)
+    elapsed = time.time() - start
+
+    if not results:
         print("Tidak ada file CSV ditemukan di direktori tersebut.")
     else:
-        for file in all_files:
-            process_tidal_csv(file)
\ No newline at end of file
+        print(f"{'Pelabuhan':<12} | {'Status':<6} | {'Baris':>6} | {'Format':>6} | {'Gap':>4} | "
+              f"{'Duplikat':>8} | {'Off-grid':>8} | Bulan tidak lengkap")
+        print("-" * 91)
+        for r in results:
+            print(f"{r['port']:<12} | {r['status']:<6} | {r['rows']:>6} | {r['invalid_format']:>6} | "
+                  f"{r['gaps']:>4} | {r['duplicates']:>8} | {r['off_grid']:>8} | "
+                  f"{', '.join(r['months_incomplete']) or '-'}")
+        print("-" * 91)
+        n_fail = sum(r['status'] == 'FAIL' for r in results)
+        print(f"{len(results)} pelabuhan divalidasi dalam {elapsed:.2f} s "
+              f"(di-ingest ulang: {len(ingested)}) | FAIL: {n_fail}")
+
+        write_report(results, args.out, meta={
+            'generated_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+            'tidal_dir': args.tidal_dir, 'reingested': ingested, 'elapsed_s': round(elapsed, 3)
+        })
+        print(f"Laporan disimpan ke '{args.out}'")
+        sys.exit(1 if n_fail else 0)
@@ -0,0 +1,76 @@
+import argparse
+import time
+import numpy as np
+
+from jssp_model import JSSP_Tardiness_Env
+
+# Microbenchmark decoder JSSP:
+# 1. Cek hasil calculate_total_tardiness identik bit-per-bit dengan implementasi acuan
+# 2. Laporkan throughput (calls/sec) keduanya
+
+def check_identical(env, n_vectors, rng):
+    vectors = rng.random((n_vectors, env.num_ops))
+    # Kasus ekstrem: semua key sama (seed 0.5 di notebook) & key tersaturasi hasil np.clip
+    vectors[0] = 0.5
+    vectors[1] = np.clip(vectors[1] * 2.0 - 0.5, 0.0, 1.0)
+
+    mismatch = 0
+    for x in vectors:
+        fast = env.calculate_total_tardiness(x)
+        ref = env.calculate_total_tardiness_reference(x)
+        if fast != ref:
+            mismatch += 1
+            print(f"  [MISMATCH] fast={fast!r} ref={ref!r}")
+
+    batch = env.calculate_total_tardiness_batch(vectors)
+    ref_all = np.array([env.calculate_total_tardiness_reference(x) for x in vectors])
+    batch_mismatch = int(np.sum(batch != ref_all))
+    if batch_mismatch:
+        print(f"  [MISMATCH] batch berbeda pada {batch_mismatch} vektor")
+    return mismatch + batch_mismatch
+
+def calls_per_sec(fn, vectors):
+    start = time.perf_counter()
+    for x in vectors:
+        fn(x)
+    elapsed = time.perf_counter() - start
+    return len(vectors) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark decoder JSSP_Tardiness_Env")
+    parser.add_argument("--data", default="Data/transformed_data.csv")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--check", type=int, default=50, help="Jumlah vektor untuk cek kesamaan hasil")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    env = JSSP_Tardiness_Env(args.data)
+    rng = np.random.default_rng(args.seed)
+    print(f"Data: {args.data} | Jobs: {env.num_jobs} | Operasi: {env.num_ops} | Backend: {env.backend}")
+
+    mismatch = check_identical(env, args.check, rng)
+    status = "OK (bit-identical)" if mismatch == 0 else f"GAGAL ({mismatch} berbeda)"
+    print(f"Cek kesamaan hasil ({args.check} vektor): {status}")
+
+    vectors = rng.random((args.calls, env.num_ops))
+    ref_rate = calls_per_sec(env.calculate_total_tardiness_reference, vectors)
+    fast_rate = calls_per_sec(env.calculate_total_tardiness, vectors)
+
+    start = time.perf_counter()
+    env.calculate_total_tardiness_batch(vectors)
+    batch_rate = len(vectors) / (time.perf_counter() - start)
+
+    print("-" * 50)
+    print(f"{'Implementasi':<20} | {'Calls/sec':>12}")
+    print("-" * 50)
+    print(f"{'reference (dict)':<20} | {ref_rate:>12.1f}")
+    print(f"{'compiled layout':<20} | {fast_rate:>12.1f}")
+    print(f"{'batch (lockstep)':<20} | {batch_rate:>12.1f}")
+    print("-" * 50)
+    print(f"Speedup compiled : {fast_rate / ref_rate:.2f}x")
+    print(f"Speedup batch    : {batch_rate / ref_rate:.2f}x (N={args.calls})")
+
+    return mismatch == 0
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
\ No newline at end of file
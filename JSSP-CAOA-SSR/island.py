@@ -0,0 +1,212 @@
+import argparse
+import multiprocessing as mp
+import queue
+import time
+import traceback
+import numpy as np
+
+from jssp_model import JSSP_Tardiness_Env
+from CAOA import CAOA
+
+# --- ISLAND MODEL CAOA ---
+# K populasi (pulau) independen berjalan di proses terpisah, masing-masing
+# dengan leader, energi, dan respawn depletion sendiri (aturan update CAOA asli).
+# Setiap M iterasi, tiap pulau mengirim agen terbaiknya ke tetangga
+# (topologi ring atau fully-connected); imigran menggantikan agen terburuk.
+# Jika satu pulau gagal (exception / proses mati), semua pulau dihentikan
+# dan run_islands melempar RuntimeError, bukan menunggu selamanya.
+
+POLL_INTERVAL = 1.0 # detik antar pengecekan status proses pulau
+# Berhenti dini per pulau tidak didukung: pulau yang berhenti tidak lagi mengirim
+# imigran sehingga tetangganya menunggu selamanya, dan panjang kurva jadi berbeda
+EARLY_STOP_OPTIONS = ('time_budget', 'patience', 'rel_tol', 'target')
+
+def neighbors(island_id, n_islands, topology):
+    if n_islands == 1:
+        return []
+    if topology == 'ring':
+        return [(island_id + 1) % n_islands]
+    if topology == 'full':
+        return [j for j in range(n_islands) if j != island_id]
+    raise ValueError(f"Topologi tidak dikenal: {topology}")
+
+def _island_worker(island_id, n_islands, data_path, inboxes, results, config):
+    # Exception dikirim ke proses induk lewat results agar tidak ada yang menunggu selamanya
+    try:
+        _run_island(island_id, n_islands, data_path, inboxes, results, config)
+    except BaseException:
+        results.put(('error', island_id, traceback.format_exc()))
+
+def _run_island(island_id, n_islands, data_path, inboxes, results, config):
+    np.random.seed(config['seed'] + island_id)
+    env = JSSP_Tardiness_Env(data_path, backend=config['backend'])
+
+    targets = neighbors(island_id, n_islands, config['topology'])
+    # Jumlah pulau yang mengirim ke pulau ini
+    n_senders = sum(island_id in neighbors(j, n_islands, config['topology'])
+                    for j in range(n_islands) if j != island_id)
+    n_migrants = config['n_migrants']
+    initial_energy = config['caoa'].get('initial_energy', 100.0)
+
+    # Paket yang datang lebih awal (ronde berikutnya, dari pulau yang lebih cepat)
+    # disimpan per ronde sampai ronde tersebut dikumpulkan
+    early = {}
+
+    def migrate(t, pos, fitness, energies):
+        if (t + 1) % config['migration_interval'] != 0 or not targets:
+            return
+        # Kirim dulu (Queue tidak memblokir), baru terima -> tidak ada deadlock.
+        # Paket diberi tag (ronde t, pengirim) supaya jadwal migrasi deterministik
+        best = np.argsort(fitness)[:n_migrants]
+        packet = (t, island_id, pos[best].copy(), fitness[best].copy())
+        for j in targets:
+            inboxes[j].put(packet)
+
+        arrived = early.pop(t, [])
+        while len(arrived) < n_senders:
+            packet = inboxes[island_id].get()
+            if packet[0] == t:
+                arrived.append(packet)
+            else:
+                early.setdefault(packet[0], []).append(packet)
+        immigrants = sorted(arrived, key=lambda packet: packet[1])
+        imm_pos = np.vstack([packet[2] for packet in immigrants])
+        imm_fit = np.concatenate([packet[3] for packet in immigrants])
+
+        # Ganti agen terburuk hanya jika imigran lebih baik
+        worst = np.argsort(fitness)[::-1][:len(imm_fit)]
+        for w, k in zip(worst, np.argsort(imm_fit)):
+            if imm_fit[k] < fitness[w]:
+                pos[w] = imm_pos[k]
+                fitness[w] = imm_fit[k]
+                energies[w] = initial_energy
+
+    start = time.time()
+    best_score, best_pos, curve = CAOA(
+        N=config['pop_size'], max_iter=config['max_iter'], lb=0.0, ub=1.0, dim=env.num_ops,
+        fobj=env.calculate_total_tardiness, fobj_batch=env.calculate_total_tardiness_batch,
+        callback=migrate, verbose=False, **config['caoa']
+    )
+    results.put(('ok', island_id, (best_score, best_pos, curve, time.time() - start)))
+
+def run_islands(data_path, n_islands=4, pop_size=25, max_iter=100,
+                migration_interval=10, n_migrants=1, topology='ring',
+                seed=0, backend=None, timeout=None, **caoa_kwargs):
+    """
+    Jalankan CAOA island model.
+
+    timeout : batas wall-clock total (detik); lewat batas -> semua pulau
+              dihentikan dan TimeoutError dilempar.
+
+    Return dict: best_score, best_pos, best_island, curves (n_islands, max_iter),
+    island_scores, island_times, wall_time.
+    """
+    early_stop = [name for name in EARLY_STOP_OPTIONS if caoa_kwargs.get(name) is not None]
+    if early_stop:
+        raise ValueError(f"Opsi berhenti dini tidak didukung di island model: {', '.join(early_stop)}")
+    config = {
+        'pop_size': pop_size, 'max_iter': max_iter,
+        'migration_interval': migration_interval, 'n_migrants': n_migrants,
+        'topology': topology, 'seed': seed, 'backend': backend, 'caoa': caoa_kwargs
+    }
+    inboxes = [mp.Queue() for _ in range(n_islands)]
+    results = mp.Queue()
+
+    start = time.time()
+    procs = [
+        mp.Process(target=_island_worker, args=(i, n_islands, data_path, inboxes, results, config))
+        for i in range(n_islands)
+    ]
+    for p in procs:
+        p.start()
+    collected = _collect_results(procs, results, start, timeout)
+    wall_time = time.time() - start
+
+    collected.sort(key=lambda r: r[0])
+    scores = np.array([r[1] for r in collected])
+    best_island = int(np.argmin(scores))
+    return {
+        'best_score': scores[best_island],
+        'best_pos': collected[best_island][2],
+        'best_island': best_island,
+        'curves': np.vstack([r[3] for r in collected]),
+        'island_scores': scores,
+        'island_times': np.array([r[4] for r in collected]),
+        'wall_time': wall_time
+    }
+
+def _collect_results(procs, results, start, timeout):
+    # Tunggu hasil semua pulau; berhenti segera jika ada pulau yang gagal
+    collected = []
+    error = None
+    while len(collected) < len(procs) and error is None:
+        try:
+            status, island_id, payload = results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            crashed = [i for i, p in enumerate(procs) if p.exitcode not in (None, 0)]
+            if crashed:
+                i = crashed[0]
+                error = RuntimeError(f"Pulau {i} berhenti dengan exitcode {procs[i].exitcode}")
+            elif timeout is not None and time.time() - start > timeout:
+                error = TimeoutError(f"Island model melewati batas waktu {timeout} s")
+            continue
+        if status == 'error':
+            error = RuntimeError(f"Pulau {island_id} gagal:\n{payload}")
+        else:
+            collected.append((island_id, *payload))
+
+    if error is not None:
+        # Pulau lain bisa sedang menunggu imigran dari pulau yang gagal
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+    for p in procs:
+        p.join()
+    if error is not None:
+        raise error
+    return collected
+
+def print_summary(result):
+    print(f"{'Pulau':<8} | {'Best Fitness':<20} | {'Waktu (s)':<10}")
+    print("-" * 45)
+    for i, (score, elapsed) in enumerate(zip(result['island_scores'], result['island_times'])):
+        mark = " *" if i == result['best_island'] else ""
+        print(f"{i:<8} | {score:<20.6e} | {elapsed:<10.2f}{mark}")
+    print("-" * 45)
+    print(f"Best global : {result['best_score']:.6e} (pulau {result['best_island']})")
+    print(f"Wall-clock  : {result['wall_time']:.2f} s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Island-model CAOA untuk JSSP")
+    parser.add_argument("--data", default="Data/transformed_data.csv")
+    parser.add_argument("--islands", type=int, default=mp.cpu_count())
+    parser.add_argument("--pop", type=int, default=25, help="Populasi per pulau")
+    parser.add_argument("--iter", type=int, default=200)
+    parser.add_argument("--migration-interval", type=int, default=10)
+    parser.add_argument("--migrants", type=int, default=1)
+    parser.add_argument("--topology", choices=['ring', 'full'], default='ring')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=None, help="Batas wall-clock total (detik)")
+    parser.add_argument("--curves", default=None, help="Simpan kurva konvergensi per pulau ke CSV")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Ukur wall-clock untuk 1, 2, 4, ... pulau (populasi per pulau tetap)")
+    args = parser.parse_args()
+
+    if args.scaling:
+        counts = sorted({1, *[2**k for k in range(1, 8) if 2**k <= args.islands], args.islands})
+        print(f"{'Pulau':<8} | {'Wall-clock (s)':<15} | {'Best Fitness':<20}")
+        print("-" * 50)
+        for k in counts:
+            res = run_islands(args.data, n_islands=k, pop_size=args.pop, max_iter=args.iter,
+                              migration_interval=args.migration_interval, n_migrants=args.migrants,
+                              topology=args.topology, seed=args.seed, timeout=args.timeout)
+            print(f"{k:<8} | {res['wall_time']:<15.2f} | {res['best_score']:<20.6e}")
+    else:
+        res = run_islands(args.data, n_islands=args.islands, pop_size=args.pop, max_iter=args.iter,
+                          migration_interval=args.migration_interval, n_migrants=args.migrants,
+                          topology=args.topology, seed=args.seed, timeout=args.timeout)
+        print_summary(res)
+        if args.curves:
+            np.savetxt(args.curves, res['curves'].T, delimiter=",",
+                       header=",".join(f"island_{i}" for i in range(args.islands)), comments="")
+            print(f"Kurva konvergensi per pulau disimpan ke '{args.curves}'")
\ No newline at end of file
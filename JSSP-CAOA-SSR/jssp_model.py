@@ -1,9 +1,38 @@
+import hashlib
+import os
+import types
+from collections import OrderedDict, namedtuple
 import numpy as np
 import pandas as pd
 
+from tidal import TIDE_KEY_SPAN, next_entry
+
+# Backend JIT opsional: aktifkan dengan CAOA_BACKEND=numba atau backend='numba'.
+# Jika numba tidak terpasang, otomatis kembali ke jalur Python.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def resolve_backend(backend=None):
+    if backend is None:
+        backend = os.environ.get('CAOA_BACKEND', 'python')
+    backend = backend.lower()
+    if backend == 'numba' and not NUMBA_AVAILABLE:
+        return 'python'
+    return backend
+
 # --- 2. JSSP ENVIRONMENT (MODEL MATEMATIKA) ---
 class JSSP_Tardiness_Env:
-    def __init__(self, csv_path):
+    # Array yang cukup untuk merekonstruksi environment tanpa CSV (mis. di worker proses)
+    ARRAY_FIELDS = ('gene_to_job_idx', 'job_offset', 'op_machine', 'op_proc',
+                    'op_arrival', 'op_due', 'op_travel')
+    # Tambahan untuk mode pasang surut (tide=TideIndex)
+    TIDE_FIELDS = ('op_tide_rule', 'tide_key', 'tide_start')
+
+    def __init__(self, csv_path, backend=None, tide=None):
+        self.backend = resolve_backend(backend)
         self.df = pd.read_csv(csv_path)
         self.num_ops = len(self.df)
         self.num_machines = self.df['Machine_ID'].max()
@@ -19,7 +48,227 @@ class JSSP_Tardiness_Env:
             self.gene_to_job.extend([j_id] * len(self.jobs_data[j_id]))
         self.gene_to_job = np.array(self.gene_to_job)
 
+        # --- COMPILED LAYOUT ---
+        # Atribut operasi disimpan sebagai array NumPy kontigu berindeks (job, op)
+        # sekali saja di sini, bukan dibaca ulang dari dict tiap pemanggilan.
+        self.job_ids = np.array(sorted(self.jobs_data.keys()))
+        self.num_jobs = len(self.job_ids)
+        ops_per_job = np.array([len(self.jobs_data[j]) for j in self.job_ids])
+        self.job_offset = np.concatenate(([0], np.cumsum(ops_per_job)[:-1]))
+        max_ops = ops_per_job.max()
+
+        self.op_machine = np.zeros((self.num_jobs, max_ops), dtype=np.int64)
+        self.op_proc = np.zeros((self.num_jobs, max_ops))
+        self.op_arrival = np.zeros((self.num_jobs, max_ops))
+        self.op_due = np.zeros((self.num_jobs, max_ops))
+        self.op_travel = np.zeros((self.num_jobs, max_ops))
+        for j_idx, j_id in enumerate(self.job_ids):
+            ops = self.jobs_data[j_id]
+            n = len(ops)
+            self.op_machine[j_idx, :n] = [op['Machine_ID'] for op in ops]
+            self.op_proc[j_idx, :n] = [op['Proc_Time'] for op in ops]
+            self.op_arrival[j_idx, :n] = [op['Arrival_Time'] for op in ops]
+            self.op_due[j_idx, :n] = [op['Due_Date'] for op in ops]
+            self.op_travel[j_idx, :n] = [op['Travel_Time'] for op in ops]
+
+        # Gen -> indeks job (0..num_jobs-1), sejajar dengan gene_to_job
+        self.gene_to_job_idx = np.repeat(np.arange(self.num_jobs), ops_per_job)
+
+        # Mode pasang surut: rule jendela pasang per (job, op), -1 = tanpa batasan.
+        # Nama kapal = bagian Job_Label sebelum '_' (KM.LAWIT_1.2025 -> KM.LAWIT)
+        self.tidal = tide is not None
+        if self.tidal:
+            self.op_tide_rule = np.full((self.num_jobs, max_ops), -1, dtype=np.int64)
+            for j_idx, j_id in enumerate(self.job_ids):
+                for o_idx, op in enumerate(self.jobs_data[j_id]):
+                    ship = str(op['Job_Label']).split('_')[0]
+                    self.op_tide_rule[j_idx, o_idx] = tide.rule_id(op['Port_Label'], ship)
+            self.tide_key = tide.tide_key
+            self.tide_start = tide.tide_start
+
+        self._init_state()
+
+    @classmethod
+    def from_arrays(cls, arrays, num_machines, backend=None):
+        # Bangun environment langsung dari array compiled layout (tanpa pandas).
+        # Array tidak disalin, sehingga bisa menunjuk ke shared memory / memmap.
+        env = cls.__new__(cls)
+        env.backend = resolve_backend(backend)
+        for name in cls.ARRAY_FIELDS:
+            setattr(env, name, arrays[name])
+        env.tidal = 'op_tide_rule' in arrays
+        if env.tidal:
+            for name in cls.TIDE_FIELDS:
+                setattr(env, name, arrays[name])
+        env.num_machines = int(num_machines)
+        env.num_jobs = env.op_machine.shape[0]
+        env.num_ops = len(env.gene_to_job_idx)
+        env._init_state()
+        return env
+
+    def export_arrays(self):
+        fields = self.ARRAY_FIELDS + (self.TIDE_FIELDS if self.tidal else ())
+        return {name: getattr(self, name) for name in fields}
+
+    def _init_state(self):
+        # State mesin/job dialokasikan sekali, di-reset tiap pemanggilan.
+        # Untuk loop Python murni, list float jauh lebih cepat diindeks
+        # daripada array NumPy (tidak ada boxing scalar per akses).
+        self._machine_zeros = [0.0] * (self.num_machines + 5)
+        self._job_zeros = [0.0] * self.num_jobs
+        self.machine_free_time = list(self._machine_zeros)
+        self.job_next_avail_time = list(self._job_zeros)
+        if self.backend == 'numba':
+            self.machine_free_time = np.zeros(self.num_machines + 5)
+            self.job_next_avail_time = np.zeros(self.num_jobs)
+
+    def decode(self, position_vector):
+        """
+        Random keys -> urutan dispatch (job_idx, op_idx) per posisi.
+
+        Operasi ke-k dari sebuah job adalah kemunculan ke-k job tersebut
+        di job_sequence, dihitung tanpa loop lewat argsort stabil.
+        """
+        priority_indices = np.argsort(position_vector)
+        job_seq = self.gene_to_job_idx[priority_indices]
+
+        order = np.argsort(job_seq, kind='stable')
+        op_seq = np.empty_like(job_seq)
+        op_seq[order] = np.arange(len(job_seq)) - self.job_offset[job_seq[order]]
+        return job_seq, op_seq
+
+    def decode_batch(self, positions):
+        # Versi matriks dari decode: positions (N, dim) -> (job_seq, op_seq) (N, dim)
+        positions = np.atleast_2d(positions)
+        priority_indices = np.argsort(positions, axis=1)
+        job_seq = self.gene_to_job_idx[priority_indices]
+
+        order = np.argsort(job_seq, axis=1, kind='stable')
+        sorted_jobs = np.take_along_axis(job_seq, order, axis=1)
+        op_sorted = np.arange(job_seq.shape[1]) - self.job_offset[sorted_jobs]
+        op_seq = np.empty_like(job_seq)
+        np.put_along_axis(op_seq, order, op_sorted, axis=1)
+        return job_seq, op_seq
+
+    def calculate_total_tardiness_batch(self, positions):
+        """
+        Evaluasi seluruh populasi (N, dim) sekaligus.
+
+        Semua N jadwal disimulasikan serentak (lockstep) sepanjang dim langkah
+        dispatch; tiap langkah adalah operasi vektor atas N agen. Hasil identik
+        dengan memanggil calculate_total_tardiness per baris.
+        """
+        job_seq, op_seq = self.decode_batch(positions)
+        n_agents, dim = job_seq.shape
+
+        if self.backend == 'numba':
+            # Kernel terkompilasi: loop per agen sudah cepat, tidak perlu lockstep
+            total_tardiness = np.empty(n_agents)
+            if self.tidal:
+                _simulate_tardiness_tidal_rows_jit(
+                    job_seq, self.op_machine[job_seq, op_seq], self.op_proc[job_seq, op_seq],
+                    self.op_arrival[job_seq, op_seq], self.op_due[job_seq, op_seq],
+                    self.op_travel[job_seq, op_seq], self.op_tide_rule[job_seq, op_seq],
+                    self.tide_key, self.tide_start,
+                    self.machine_free_time, self.job_next_avail_time, total_tardiness
+                )
+                return total_tardiness
+            _simulate_tardiness_rows_jit(
+                job_seq, self.op_machine[job_seq, op_seq], self.op_proc[job_seq, op_seq],
+                self.op_arrival[job_seq, op_seq], self.op_due[job_seq, op_seq],
+                self.op_travel[job_seq, op_seq],
+                self.machine_free_time, self.job_next_avail_time, total_tardiness
+            )
+            return total_tardiness
+
+        # Gather atribut lalu transpose -> (dim, N) agar tiap langkah membaca baris kontigu
+        machines = self.op_machine[job_seq, op_seq].T.copy()
+        proc = self.op_proc[job_seq, op_seq].T.copy()
+        arrival = self.op_arrival[job_seq, op_seq].T.copy()
+        due = self.op_due[job_seq, op_seq].T.copy()
+        travel = self.op_travel[job_seq, op_seq].T.copy()
+        jobs = job_seq.T.copy()
+        tide_rule = self.op_tide_rule[job_seq, op_seq].T.copy() if self.tidal else None
+
+        # State (N, num_machines) & (N, num_jobs), diakses lewat indeks datar
+        n_machine_slots = self.num_machines + 5
+        machine_free_time = np.zeros(n_agents * n_machine_slots)
+        job_next_avail_time = np.zeros(n_agents * self.num_jobs)
+        machine_base = np.arange(n_agents) * n_machine_slots
+        job_base = np.arange(n_agents) * self.num_jobs
+
+        total_tardiness = np.zeros(n_agents)
+        for k in range(dim):
+            m_idx = machine_base + machines[k]
+            j_idx = job_base + jobs[k]
+
+            ready_time = np.maximum(job_next_avail_time[j_idx], arrival[k])
+            start_time = np.maximum(machine_free_time[m_idx], ready_time)
+            if tide_rule is not None:
+                # Tunda sandar ke jendela pasang berikutnya (satu searchsorted untuk N agen)
+                start_time = next_entry(self.tide_key, self.tide_start, tide_rule[k], start_time)
+            finish_time = start_time + proc[k]
+
+            total_tardiness += np.maximum(0.0, finish_time - due[k])
+
+            machine_free_time[m_idx] = finish_time
+            job_next_avail_time[j_idx] = finish_time + travel[k]
+
+        return total_tardiness
+
     def calculate_total_tardiness(self, position_vector):
+        job_seq, op_seq = self.decode(position_vector)
+
+        # Ambil atribut operasi sesuai urutan dispatch (gather sekali)
+        machines = self.op_machine[job_seq, op_seq]
+        proc = self.op_proc[job_seq, op_seq]
+        arrival = self.op_arrival[job_seq, op_seq]
+        due = self.op_due[job_seq, op_seq]
+        travel = self.op_travel[job_seq, op_seq]
+
+        if self.tidal:
+            return self._calculate_total_tardiness_tidal(job_seq, op_seq, machines, proc,
+                                                         arrival, due, travel)
+
+        if self.backend == 'numba':
+            self.machine_free_time.fill(0.0)
+            self.job_next_avail_time.fill(0.0)
+            return _simulate_tardiness_jit(
+                job_seq, machines, proc, arrival, due, travel,
+                self.machine_free_time, self.job_next_avail_time
+            )
+
+        self.machine_free_time[:] = self._machine_zeros
+        self.job_next_avail_time[:] = self._job_zeros
+
+        return _simulate_tardiness(
+            job_seq.tolist(), machines.tolist(), proc.tolist(), arrival.tolist(),
+            due.tolist(), travel.tolist(),
+            self.machine_free_time, self.job_next_avail_time
+        )
+
+    def _calculate_total_tardiness_tidal(self, job_seq, op_seq, machines, proc, arrival, due, travel):
+        tide_rule = self.op_tide_rule[job_seq, op_seq]
+        if self.backend == 'numba':
+            self.machine_free_time.fill(0.0)
+            self.job_next_avail_time.fill(0.0)
+            return _simulate_tardiness_tidal_jit(
+                job_seq, machines, proc, arrival, due, travel, tide_rule,
+                self.tide_key, self.tide_start,
+                self.machine_free_time, self.job_next_avail_time
+            )
+
+        self.machine_free_time[:] = self._machine_zeros
+        self.job_next_avail_time[:] = self._job_zeros
+        return _simulate_tardiness_tidal(
+            job_seq.tolist(), machines.tolist(), proc.tolist(), arrival.tolist(),
+            due.tolist(), travel.tolist(), tide_rule.tolist(), self.tide_key, self.tide_start,
+            self.machine_free_time, self.job_next_avail_time
+        )
+
+    def calculate_total_tardiness_reference(self, position_vector):
+        # Implementasi awal berbasis dict, dipertahankan sebagai acuan
+        # kebenaran (lihat benchmark_decoder.py)
         # 1. DECODING
         priority_indices = np.argsort(position_vector)
         job_sequence = self.gene_to_job[priority_indices]
@@ -71,4 +320,180 @@ class JSSP_Tardiness_Env:
             
             job_op_idx[job_id] += 1
             
-        return total_tardiness
\ No newline at end of file
+        return total_tardiness
+
+# --- CACHE FITNESS (LRU) ---
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+class TardinessCache:
+    """
+    Cache LRU antara CAOA dan JSSP_Tardiness_Env.
+
+    Banyak vektor random-key berbeda menghasilkan job_sequence yang sama
+    (agen ditarik ke leader, key tersaturasi oleh np.clip, seed 0.5), jadi
+    kunci cache adalah hash dari job_sequence hasil decode, bukan vektor float.
+    Objek ini bisa langsung dipakai sebagai fobj_batch; cache_info() dibaca CAOA
+    untuk kolom Hit/Miss di tabel verbose.
+    """
+    # Perkiraan memori per entri: digest 16 byte + float + node OrderedDict
+    ENTRY_BYTES = 200
+
+    def __init__(self, env, max_memory_mb=64, evaluate_batch=None):
+        self.env = env
+        # Evaluator untuk kandidat yang miss (default: decoder batch env,
+        # bisa diganti ParallelEvaluator.evaluate)
+        self._evaluate_batch = evaluate_batch or env.calculate_total_tardiness_batch
+        self.maxsize = max(1, int(max_memory_mb * 2**20) // self.ENTRY_BYTES)
+        self._store = OrderedDict()
+        self._key_dtype = np.int16 if env.num_jobs < 2**15 else np.int32
+        self.hits = 0
+        self.misses = 0
+
+    def _keys(self, positions):
+        priority_indices = np.argsort(positions, axis=1)
+        job_seq = self.env.gene_to_job_idx[priority_indices].astype(self._key_dtype)
+        return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in job_seq]
+
+    def calculate_total_tardiness_batch(self, positions):
+        positions = np.atleast_2d(positions)
+        keys = self._keys(positions)
+        fitness = np.empty(len(keys))
+
+        miss_rows = []
+        miss_first = {} # key -> baris pertama yang miss (duplikat dalam satu batch cukup dihitung sekali)
+        for i, key in enumerate(keys):
+            value = self._store.get(key)
+            if value is not None:
+                self._store.move_to_end(key)
+                fitness[i] = value
+                self.hits += 1
+            elif key in miss_first:
+                self.hits += 1
+            else:
+                miss_first[key] = i
+                miss_rows.append(i)
+                self.misses += 1
+
+        if miss_rows:
+            values = np.asarray(self._evaluate_batch(positions[miss_rows]), dtype=float)
+            for i, value in zip(miss_rows, values):
+                fitness[i] = value
+                self._store[keys[i]] = float(value)
+            while len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+
+        # Isi duplikat yang miss di batch yang sama
+        for i, key in enumerate(keys):
+            first = miss_first.get(key)
+            if first is not None and first != i:
+                fitness[i] = fitness[first]
+        return fitness
+
+    def calculate_total_tardiness(self, position_vector):
+        return self.calculate_total_tardiness_batch(position_vector)[0]
+
+    __call__ = calculate_total_tardiness_batch
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._store))
+
+    def cache_clear(self):
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _simulate_tardiness(job_seq, machines, proc, arrival, due, travel,
+                        machine_free_time, job_next_avail_time):
+    # Loop simulasi yang sama persis dengan calculate_total_tardiness_reference,
+    # tetapi membaca dari array datar sesuai urutan dispatch
+    total_tardiness = 0.0
+    for k in range(len(job_seq)):
+        j = job_seq[k]
+        m_id = machines[k]
+
+        ready_time = max(job_next_avail_time[j], arrival[k])
+        start_time = max(machine_free_time[m_id], ready_time)
+        finish_time = start_time + proc[k]
+
+        total_tardiness += max(0.0, finish_time - due[k])
+
+        machine_free_time[m_id] = finish_time
+        job_next_avail_time[j] = finish_time + travel[k]
+
+    return total_tardiness
+
+
+def _simulate_tardiness_rows(jobs, machines, proc, arrival, due, travel,
+                             machine_free_time, job_next_avail_time, out):
+    # Satu simulasi per baris (agen), state di-reset di antara baris
+    for i in range(jobs.shape[0]):
+        machine_free_time[:] = 0.0
+        job_next_avail_time[:] = 0.0
+        out[i] = _simulate_tardiness_jit(
+            jobs[i], machines[i], proc[i], arrival[i], due[i], travel[i],
+            machine_free_time, job_next_avail_time
+        )
+
+def _tide_entry(t, rule, tide_key, tide_start):
+    # Versi skalar tidal.next_entry: satu searchsorted pada kunci gabungan
+    i = np.searchsorted(tide_key, rule * TIDE_KEY_SPAN + t)
+    if i < len(tide_key) and tide_key[i] < (rule + 1) * TIDE_KEY_SPAN:
+        return max(t, tide_start[i])
+    return t
+
+
+def _simulate_tardiness_tidal(job_seq, machines, proc, arrival, due, travel, tide_rule,
+                              tide_key, tide_start, machine_free_time, job_next_avail_time):
+    # Sama dengan _simulate_tardiness, tetapi sandar hanya boleh dimulai
+    # di dalam jendela pasang untuk operasi yang punya rule (tide_rule >= 0)
+    total_tardiness = 0.0
+    for k in range(len(job_seq)):
+        j = job_seq[k]
+        m_id = machines[k]
+
+        ready_time = max(job_next_avail_time[j], arrival[k])
+        start_time = max(machine_free_time[m_id], ready_time)
+        if tide_rule[k] >= 0:
+            start_time = _tide_entry(start_time, tide_rule[k], tide_key, tide_start)
+        finish_time = start_time + proc[k]
+
+        total_tardiness += max(0.0, finish_time - due[k])
+
+        machine_free_time[m_id] = finish_time
+        job_next_avail_time[j] = finish_time + travel[k]
+
+    return total_tardiness
+
+
+def _jit_with(func, **helpers):
+    # Kompilasi salinan func yang memanggil helper JIT (nama global diganti),
+    # tanpa mengubah func sendiri yang dipakai backend Python
+    scope = dict(func.__globals__)
+    scope.update(helpers)
+    clone = types.FunctionType(func.__code__, scope, func.__name__,
+                               func.__defaults__, func.__closure__)
+    clone.__qualname__ = func.__qualname__
+    return njit(cache=True)(clone)
+
+
+def _simulate_tardiness_tidal_rows(jobs, machines, proc, arrival, due, travel, tide_rule,
+                                   tide_key, tide_start, machine_free_time,
+                                   job_next_avail_time, out):
+    for i in range(jobs.shape[0]):
+        machine_free_time[:] = 0.0
+        job_next_avail_time[:] = 0.0
+        out[i] = _simulate_tardiness_tidal_jit(
+            jobs[i], machines[i], proc[i], arrival[i], due[i], travel[i], tide_rule[i],
+            tide_key, tide_start, machine_free_time, job_next_avail_time
+        )
+
+if NUMBA_AVAILABLE:
+    # cache=True: hasil kompilasi disimpan di __pycache__, tidak dikompilasi ulang tiap run
+    _simulate_tardiness_jit = njit(cache=True)(_simulate_tardiness)
+    _simulate_tardiness_rows_jit = njit(cache=True)(_simulate_tardiness_rows)
+    # Salinan JIT _tide_entry dengan nama terpisah: jalur Python tetap memanggil
+    # fungsi Python murni, hanya kernel JIT yang memanggil _tide_entry_jit
+    _tide_entry_jit = njit(cache=True)(_tide_entry)
+    _simulate_tardiness_tidal_jit = _jit_with(_simulate_tardiness_tidal, _tide_entry=_tide_entry_jit)
+    _simulate_tardiness_tidal_rows_jit = njit(cache=True)(_simulate_tardiness_tidal_rows)
@@ -0,0 +1,70 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+from jssp_model import JSSP_Tardiness_Env
+
+# --- EVALUASI FITNESS PARALEL (PROCESS POOL + SHARED MEMORY) ---
+# Array environment (compiled layout) ditaruh di shared memory SEKALI.
+# Tiap worker memasang array tersebut saat start, jadi per iterasi yang
+# dikirim hanya blok posisi (n, dim) dan yang kembali hanya n nilai fitness.
+
+_worker_env = None
+_worker_shms = []
+
+def _init_worker(meta, num_machines, backend):
+    global _worker_env, _worker_shms
+    arrays = {}
+    for name, (shm_name, shape, dtype) in meta.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_shms.append(shm) # simpan referensi agar buffer tidak ditutup
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    _worker_env = JSSP_Tardiness_Env.from_arrays(arrays, num_machines, backend)
+
+def _eval_chunk(positions):
+    return _worker_env.calculate_total_tardiness_batch(positions)
+
+class ParallelEvaluator:
+    def __init__(self, env, workers=None):
+        self.workers = workers or mp.cpu_count()
+        self._shms = []
+        meta = {}
+        for name, arr in env.export_arrays().items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._shms.append(shm)
+            meta[name] = (shm.name, arr.shape, arr.dtype.str)
+
+        self.pool = mp.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(meta, env.num_machines, env.backend)
+        )
+
+    def evaluate(self, positions):
+        positions = np.atleast_2d(positions)
+        if len(positions) == 0: # mis. N=1 -> tidak ada agen yang bergerak
+            return np.empty(0)
+        n_chunks = min(self.workers, len(positions))
+        chunks = np.array_split(positions, n_chunks)
+        results = self.pool.map(_eval_chunk, chunks)
+        return np.concatenate(results)
+
+    __call__ = evaluate
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
\ No newline at end of file
@@ -1,19 +1,27 @@
+import argparse
+import multiprocessing as mp
 import time
 import numpy as np
 import pandas as pd
 
 # Import modul yang sudah Anda miliki
-from jssp_model import JSSP_Tardiness_Env
-from CAOA import CAOA
+from jssp_model import JSSP_Tardiness_Env, TardinessCache
+from CAOA import CAOA, make_sink
+from parallel_eval import ParallelEvaluator
+from tidal import TideIndex
 
-def run_solver(csv_path):
+def run_solver(csv_path, workers=1, cache_mb=64,
+               checkpoint_path=None, checkpoint_every=0, resume_from=None,
+               tidal_dir=None, tidal_rules=None, trace_path=None):
     print(f"=== MEMULAI SOLVER JSSP-CAOA ===")
     print(f"Reading Data from: {csv_path}")
 
     # 1. Inisialisasi Environment
     # Environment akan membaca CSV dan membangun struktur data Job/Operasi
+    # Mode pasang surut: sandar hanya di dalam jendela elevasi yang layak
+    tide = TideIndex(tidal_dir, tidal_rules) if tidal_dir else None
     try:
-        env = JSSP_Tardiness_Env(csv_path)
+        env = JSSP_Tardiness_Env(csv_path, tide=tide)
     except FileNotFoundError:
         print(f"ERROR: File tidak ditemukan di {csv_path}")
         return
@@ -22,6 +30,8 @@ def run_solver(csv_path):
     print(f"Total Jobs (Kapal) : {len(env.jobs_data)}")
     print(f"Total Mesin (Port) : {env.num_machines}")
     print(f"Total Operasi      : {env.num_ops}")
+    if env.tidal:
+        print(f"Operasi ber-aturan pasang : {(env.op_tide_rule >= 0).sum()}")
     print("-" * 50)
 
     # 2. Definisi Wrapper Fungsi Objektif
@@ -29,6 +39,22 @@ def run_solver(csv_path):
     def objective_function(position_vector):
         return env.calculate_total_tardiness(position_vector)
 
+    # Versi batch: seluruh populasi disimulasikan serentak (lockstep)
+    def objective_function_batch(positions):
+        return env.calculate_total_tardiness_batch(positions)
+
+    # Multi-core: populasi dibagi ke worker pool (data environment via shared memory)
+    evaluator = None
+    trace = None
+    if workers > 1:
+        evaluator = ParallelEvaluator(env, workers=workers)
+        objective_function_batch = evaluator.evaluate
+
+    # Cache LRU berbasis job_sequence: kandidat yang decode ke urutan sama tidak disimulasikan ulang
+    if cache_mb > 0:
+        objective_function_batch = TardinessCache(env, max_memory_mb=cache_mb,
+                                                  evaluate_batch=objective_function_batch)
+
     # 3. Konfigurasi Parameter CAOA
     # Anda bisa tuning parameter ini untuk hasil yang lebih baik
     N_POPULATION = 100       # Jumlah agen (buaya)
@@ -41,21 +67,38 @@ def run_solver(csv_path):
     print(f"Populasi         : {N_POPULATION}")
     print(f"Iterasi          : {MAX_ITERATION}")
     print(f"Dimensi Masalah  : {DIMENSION}")
+    print(f"Workers          : {workers}")
+    print(f"Cache Fitness    : {f'{cache_mb} MB' if cache_mb > 0 else 'nonaktif'}")
     print(f"Target           : Minimasi Total Tardiness")
     print("-" * 50)
 
     # 4. Eksekusi CAOA
     print("\n>>> Menjalankan Algoritma CAOA...\n")
     
-    best_score, best_pos, convergence_curve = CAOA(
-        N=N_POPULATION,
-        max_iter=MAX_ITERATION,
-        lb=LB,
-        ub=UB,
-        dim=DIMENSION,
-        fobj=objective_function,
-        verbose_interval=10 # Update print setiap 10 iterasi
-    )
+    try:
+        # Trace per iterasi (waktu per fase, jumlah evaluasi, cache, energi)
+        if trace_path:
+            trace = make_sink(trace_path)
+        best_score, best_pos, convergence_curve = CAOA(
+            N=N_POPULATION,
+            max_iter=MAX_ITERATION,
+            lb=LB,
+            ub=UB,
+            dim=DIMENSION,
+            fobj=objective_function,
+            fobj_batch=objective_function_batch,
+            verbose_interval=10, # Update print setiap 10 iterasi
+            checkpoint_path=checkpoint_path,
+            checkpoint_every=checkpoint_every,
+            resume_from=resume_from,
+            trace=trace
+        )
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+        if trace is not None:
+            trace.close()
+            print(f"Trace instrumentasi disimpan ke '{trace_path}'")
 
     # 5. Hasil Akhir
     print("\n" + "="*50)
@@ -75,8 +118,58 @@ def run_solver(csv_path):
     # np.savetxt("convergence_curve.csv", convergence_curve, delimiter=",")
     # print("\nData konvergensi disimpan ke 'convergence_curve.csv'")
 
+def scaling_curve(csv_path, pop_size=100, repeats=3, max_workers=None):
+    # Ukur waktu evaluasi satu blok populasi (pop_size, dim) untuk 1..cpu_count worker
+    env = JSSP_Tardiness_Env(csv_path)
+    max_workers = max_workers or mp.cpu_count()
+    positions = np.random.rand(pop_size, env.num_ops)
+
+    print(f"\n[Scaling Curve] Populasi {pop_size} x Dimensi {env.num_ops}, {repeats} ulangan")
+    print(f"{'Workers':<10} | {'Waktu/iter (s)':<15} | {'Speedup':<10} | {'Efisiensi':<10}")
+    print("-" * 55)
+
+    base_time = None
+    for w in range(1, max_workers + 1):
+        with ParallelEvaluator(env, workers=w) as evaluator:
+            evaluator.evaluate(positions[:w]) # warm-up worker
+            start = time.perf_counter()
+            for _ in range(repeats):
+                evaluator.evaluate(positions)
+            per_iter = (time.perf_counter() - start) / repeats
+        base_time = base_time or per_iter
+        speedup = base_time / per_iter
+        print(f"{w:<10} | {per_iter:<15.4f} | {speedup:<10.2f} | {speedup / w:<10.2%}")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solver JSSP-CAOA")
     # Path ke file data Anda
-    DATA_PATH = "Data/jssp_data.csv"
-    
-    run_solver(DATA_PATH)
\ No newline at end of file
+    parser.add_argument("--data", default="Data/transformed_data.csv")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Jumlah proses untuk evaluasi fitness (default 1 = single-core)")
+    parser.add_argument("--cache-mb", type=float, default=64,
+                        help="Batas memori cache fitness LRU dalam MB (0 = nonaktif)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="File .npz untuk snapshot berkala (mis. results/caoa_ckpt.npz)")
+    parser.add_argument("--checkpoint-every", type=int, default=50,
+                        help="Simpan checkpoint setiap K iterasi")
+    parser.add_argument("--resume", default=None,
+                        help="Lanjutkan run dari file checkpoint")
+    parser.add_argument("--tide", action="store_true",
+                        help="Aktifkan batasan jendela pasang surut (Data/Tidal + tidal_rules.csv)")
+    parser.add_argument("--tidal-dir", default="Data/Tidal")
+    parser.add_argument("--tidal-rules", default="Data/tidal_rules.csv")
+    parser.add_argument("--trace", default=None,
+                        help="File trace per iterasi: .jsonl atau .csv (mis. results/trace.jsonl)")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Tampilkan scaling curve evaluasi untuk 1..cpu_count worker, lalu keluar")
+    args = parser.parse_args()
+
+    if args.scaling:
+        scaling_curve(args.data)
+    else:
+        run_solver(args.data, workers=args.workers, cache_mb=args.cache_mb,
+                   checkpoint_path=args.checkpoint or args.resume,
+                   checkpoint_every=args.checkpoint_every if (args.checkpoint or args.resume) else 0,
+                   resume_from=args.resume,
+                   tidal_dir=args.tidal_dir if args.tide else None,
+                   tidal_rules=args.tidal_rules, trace_path=args.trace)
\ No newline at end of file
@@ -0,0 +1,172 @@
+import argparse
+import csv
+import glob
+import itertools
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from jssp_model import JSSP_Tardiness_Env
+from CAOA import CAOA
+
+# --- SWEEP PARAMETER CAOA (PENGGANTI caoa_matlab/sensitivity_*.m) ---
+# Grid konfigurasi x seed disebar ke process pool. Setiap hasil langsung
+# ditulis ke store append-only (CSV, atau folder Parquet), sehingga sel yang
+# sudah selesai dilewati saat sweep dijalankan ulang setelah berhenti.
+
+PARAM_NAMES = ['alpha', 'beta', 'gamma', 'delta', 'initial_energy', 'N', 'max_iter']
+INT_PARAMS = {'N', 'max_iter'}
+
+# Nilai default = nilai tetap di skrip MATLAB
+DEFAULTS = {'alpha': 0.5, 'beta': 0.1, 'gamma': 0.1, 'delta': 1e-4,
+            'initial_energy': 100.0, 'N': 30, 'max_iter': 500}
+
+# Satu-faktor seperti sensitivity_alpha.m, sensitivity_beta.m, dst.
+PRESETS = {
+    'alpha': {'alpha': [0.1, 0.3, 0.5, 0.7, 0.9]},
+    'beta': {'beta': [0.05, 0.1, 0.2, 0.3, 0.4]},
+    'gamma': {'gamma': [0.01, 0.05, 0.1, 0.2]},
+    'delta': {'delta': [1e-6, 1e-5, 1e-4, 1e-3]},
+    'energy': {'initial_energy': [10, 50, 100, 200]},
+}
+
+def build_grid(values):
+    # values: {param: [nilai, ...]} -> list config (produk kartesius)
+    names = PARAM_NAMES
+    lists = [values.get(name, [DEFAULTS[name]]) for name in names]
+    grid = []
+    for combo in itertools.product(*lists):
+        config = {}
+        for name, value in zip(names, combo):
+            config[name] = int(value) if name in INT_PARAMS else float(value)
+        grid.append(config)
+    return grid
+
+def cell_key(config, seed):
+    return "|".join(f"{name}={config[name]!r}" for name in PARAM_NAMES) + f"|seed={seed}"
+
+# ==========================================
+# STORE HASIL (APPEND-ONLY)
+# ==========================================
+class ResultStore:
+    def __init__(self, path):
+        self.path = path
+        self.is_parquet = path.endswith('.parquet')
+        self._part = 0
+
+    def load(self):
+        if self.is_parquet:
+            parts = sorted(glob.glob(os.path.join(self.path, 'part-*.parquet')))
+            self._part = len(parts)
+            if not parts:
+                return pd.DataFrame()
+            return pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return pd.DataFrame()
+        return pd.read_csv(self.path)
+
+    def completed_keys(self):
+        df = self.load()
+        return set(df['cell_key']) if 'cell_key' in df.columns else set()
+
+    def append(self, rows):
+        if not rows:
+            return
+        if self.is_parquet:
+            os.makedirs(self.path, exist_ok=True)
+            pd.DataFrame(rows).to_parquet(os.path.join(self.path, f'part-{self._part:06d}.parquet'), index=False)
+            self._part += 1
+            return
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            if write_header:
+                writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+# ==========================================
+# WORKER
+# ==========================================
+_worker_env = None
+
+def _init_worker(data_path, backend):
+    global _worker_env
+    _worker_env = JSSP_Tardiness_Env(data_path, backend=backend)
+
+def _run_cell(task):
+    config, seed = task
+    np.random.seed(seed)
+    start = time.time()
+    best_score, _, curve = CAOA(
+        N=config['N'], max_iter=config['max_iter'], lb=0.0, ub=1.0, dim=_worker_env.num_ops,
+        fobj=_worker_env.calculate_total_tardiness,
+        fobj_batch=_worker_env.calculate_total_tardiness_batch,
+        alpha=config['alpha'], beta=config['beta'], gamma=config['gamma'],
+        delta=config['delta'], initial_energy=config['initial_energy'],
+        verbose=False
+    )
+    row = {'cell_key': cell_key(config, seed), **config, 'seed': seed,
+           'best_score': float(best_score), 'iterations': len(curve),
+           'runtime_s': time.time() - start}
+    return row
+
+def run_sweep(data_path, grid, runs=10, store_path='sweep_results.csv',
+              workers=None, seed_base=0, backend=None):
+    store = ResultStore(store_path)
+    done = store.completed_keys()
+
+    tasks = [(config, seed_base + r) for config in grid for r in range(runs)]
+    pending = [task for task in tasks if cell_key(*task) not in done]
+    print(f"Total sel: {len(tasks)} | Sudah selesai: {len(tasks) - len(pending)} | Sisa: {len(pending)}")
+    if not pending:
+        return store.load()
+
+    workers = workers or mp.cpu_count()
+    start = time.time()
+    with mp.Pool(workers, initializer=_init_worker, initargs=(data_path, backend)) as pool:
+        # imap_unordered: hasil ditulis segera setelah tiap sel selesai
+        for n_done, row in enumerate(pool.imap_unordered(_run_cell, pending), start=1):
+            store.append([row])
+            elapsed = time.time() - start
+            print(f"[{n_done}/{len(pending)}] {elapsed:8.1f}s | seed={row['seed']:<4} | "
+                  f"best={row['best_score']:.6e} | "
+                  + " ".join(f"{name}={row[name]}" for name in PARAM_NAMES))
+    return store.load()
+
+def summarize(results):
+    # Mean & std per konfigurasi (setara mean_alpha / std_alpha di MATLAB)
+    if results.empty:
+        return results
+    summary = results.groupby(PARAM_NAMES)['best_score'].agg(['mean', 'std', 'min', 'count'])
+    return summary.reset_index()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep parameter CAOA pada objektif JSSP")
+    parser.add_argument("--data", default="Data/transformed_data.csv")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=None,
+                        help="Sweep satu-faktor setara skrip sensitivity_*.m")
+    for name in PARAM_NAMES:
+        ptype = int if name in INT_PARAMS else float
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=ptype, nargs='+', default=None)
+    parser.add_argument("--runs", type=int, default=10, help="Jumlah seed per konfigurasi")
+    parser.add_argument("--seed-base", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep_results.csv",
+                        help="Store hasil: file .csv atau folder .parquet")
+    args = parser.parse_args()
+
+    values = dict(PRESETS[args.preset]) if args.preset else {}
+    for name in PARAM_NAMES:
+        if getattr(args, name) is not None:
+            values[name] = getattr(args, name)
+
+    grid = build_grid(values)
+    results = run_sweep(args.data, grid, runs=args.runs, store_path=args.out,
+                        workers=args.workers, seed_base=args.seed_base)
+
+    print("\nRingkasan (Best Score per konfigurasi):")
+    print(summarize(results).to_string(index=False))
\ No newline at end of file
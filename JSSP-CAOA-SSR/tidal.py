@@ -0,0 +1,275 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# --- INDEKS JENDELA PASANG SURUT ---
+# Untuk setiap aturan (pelabuhan, elevasi min/max, buffer) dari tidal_rules.csv,
+# deret pasang per jam diubah SEKALI menjadi daftar jendela masuk yang layak
+# [start, end] (jam sejak TIME_ORIGIN, sama dengan sumbu waktu transformed_data).
+# Semua jendela disimpan dalam satu array datar berkunci gabungan
+# rule * TIDE_KEY_SPAN + end, sehingga waktu masuk berikutnya untuk rule mana pun
+# cukup dicari dengan satu np.searchsorted.
+
+TIME_ORIGIN = pd.Timestamp('2025-01-01 00:00:00') # t = 0 pada data JSSP
+TIDE_KEY_SPAN = 1e6 # pemisah antar rule pada kunci gabungan (jauh di atas horizon jam)
+SAMPLE_HOURS = 1.0  # satu sampel elevasi berlaku selama 1 jam
+NS_PER_HOUR = 3600 * 10**9
+
+TIMESTAMP_PATTERN = r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$' # sama dengan check_timestamp_format
+STORE_VERSION = 1
+
+def parse_tidal_csv(file_path):
+    """
+    Parse satu file Tidal/*.csv.
+
+    Return (times, elevation, invalid_rows):
+    times int64 ns sejak epoch Unix (urut waktu), elevation float32,
+    invalid_rows = [[baris, timestamp_asli, dapat_diparse], ...] untuk format string yang salah.
+    '24:00:00' adalah jam 00:00 hari berikutnya (data per jam 01:00..24:00).
+    """
+    df = pd.read_csv(file_path)
+    ts = df['timestamp'].astype(str).str.strip()
+    is_24 = ts.str.endswith('24:00:00')
+    dt = pd.to_datetime(ts.str.replace('24:00:00', '00:00:00', regex=False), errors='coerce')
+    dt = dt + pd.to_timedelta(is_24.astype(int), unit='D')
+
+    valid = dt.notna().to_numpy()
+    bad_format = ~ts.str.match(TIMESTAMP_PATTERN).to_numpy() | ~valid
+    invalid_rows = [[int(i), ts.iat[i], bool(valid[i])] for i in np.flatnonzero(bad_format)]
+
+    times = dt[valid].to_numpy().astype('datetime64[ns]').astype(np.int64)
+    elevation = df['tidal_elevation'].to_numpy(dtype=np.float32)[valid]
+    order = np.argsort(times, kind='stable')
+    return times[order], elevation[order], invalid_rows
+
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _save_array(path, arr):
+    tmp_path = path + '.tmp.npy'
+    np.save(tmp_path, arr)
+    os.replace(tmp_path, path)
+
+# ==========================================
+# STORE BINER KOLUMNAR
+# ==========================================
+class TidalStore:
+    """
+    Store biner deret pasang: per pelabuhan <PORT>_time.npy (int64 ns, urut)
+    dan <PORT>_elev.npy (float32), dibuka lewat memmap dalam hitungan milidetik.
+
+    manifest.json mencatat mtime, ukuran, dan hash blake2b tiap file sumber;
+    ingest() hanya mem-parse ulang file yang berubah (file yang hanya
+    tersentuh/mtime berubah tetapi isi sama tidak di-parse ulang).
+    """
+    def __init__(self, tidal_dir='Data/Tidal', store_dir=None, refresh=True):
+        self.tidal_dir = tidal_dir
+        self.store_dir = store_dir or os.path.join(tidal_dir, '.cache', 'store')
+        self.manifest_path = os.path.join(self.store_dir, 'manifest.json')
+        self.manifest = self._read_manifest()
+        self.ingested = []
+        if refresh:
+            self.ingest()
+
+    def _read_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == STORE_VERSION:
+                return manifest
+        return {'version': STORE_VERSION, 'ports': {}}
+
+    def _paths(self, port):
+        return (os.path.join(self.store_dir, f"{port}_time.npy"),
+                os.path.join(self.store_dir, f"{port}_elev.npy"))
+
+    def ingest(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        ports = self.manifest['ports']
+        self.ingested = []
+        sources = {}
+        for path in sorted(glob.glob(os.path.join(self.tidal_dir, '*.csv'))):
+            sources[os.path.splitext(os.path.basename(path))[0].upper()] = path
+
+        for port, path in sources.items():
+            stat = os.stat(path)
+            entry = ports.get(port)
+            stored = all(os.path.exists(p) for p in self._paths(port))
+            if entry and stored and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                continue
+            digest = _file_digest(path)
+            if entry and stored and entry['hash'] == digest:
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                continue
+
+            times, elevation, invalid_rows = parse_tidal_csv(path)
+            time_path, elev_path = self._paths(port)
+            _save_array(time_path, times)
+            _save_array(elev_path, elevation)
+            ports[port] = {
+                'source': os.path.basename(path), 'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size, 'hash': digest, 'rows': int(len(times)),
+                'invalid_rows': invalid_rows
+            }
+            self.ingested.append(port)
+
+        # File sumber yang dihapus -> buang dari store
+        for port in sorted(set(ports) - set(sources)):
+            for p in self._paths(port):
+                if os.path.exists(p):
+                    os.remove(p)
+            del ports[port]
+
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+        return self.ingested
+
+    @property
+    def ports(self):
+        return sorted(self.manifest['ports'])
+
+    def info(self, port):
+        return self.manifest['ports'][port]
+
+    def series(self, port, mmap=True):
+        # -> (times int64 ns, elevation float32), tanpa parsing CSV
+        time_path, elev_path = self._paths(port)
+        mode = 'r' if mmap else None
+        return np.load(time_path, mmap_mode=mode), np.load(elev_path, mmap_mode=mode)
+
+    def hours(self, port):
+        # Deret dalam jam sejak TIME_ORIGIN (sumbu waktu JSSP)
+        times, elevation = self.series(port)
+        origin = TIME_ORIGIN.value
+        return (times - origin) / NS_PER_HOUR, np.asarray(elevation)
+
+def feasible_windows(hours, elevation, min_elevation, max_elevation, buffer_time=0.0):
+    """
+    Jendela masuk yang layak: elevasi dalam [min, max] selama minimal buffer_time jam.
+
+    Return (start, end): kapal boleh mulai sandar pada t dengan start <= t <= end.
+    Sampel yang terpisah lebih dari SAMPLE_HOURS (data hilang) memutus jendela.
+    """
+    # Ambang dibandingkan pada presisi deret (float32 di store): 2.4 == float32(2.4)
+    lo = np.asarray(min_elevation, dtype=elevation.dtype)
+    hi = np.asarray(max_elevation, dtype=elevation.dtype)
+    ok = (elevation >= lo) & (elevation <= hi)
+    gap = np.diff(hours) > SAMPLE_HOURS * 1.5
+    first = ok & ~np.concatenate(([False], ok[:-1] & ~gap))
+    last = ok & ~np.concatenate((ok[1:] & ~gap, [False]))
+
+    start = hours[first]
+    end = hours[last] + SAMPLE_HOURS - buffer_time
+    keep = end >= start
+    return start[keep], end[keep]
+
+def next_entry(tide_key, tide_start, rule, t):
+    # Waktu masuk paling awal >= t untuk rule (skalar atau array).
+    # Di luar horizon data pasang tidak ada batasan (t dikembalikan apa adanya).
+    rule = np.asarray(rule)
+    t = np.asarray(t, dtype=float)
+    if len(tide_key) == 0:
+        return t
+    idx = np.searchsorted(tide_key, rule * TIDE_KEY_SPAN + t)
+    safe = np.minimum(idx, len(tide_key) - 1)
+    found = (idx < len(tide_key)) & (tide_key[safe] < (rule + 1) * TIDE_KEY_SPAN) & (rule >= 0)
+    return np.where(found, np.maximum(t, tide_start[safe]), t)
+
+class TideIndex:
+    """
+    Jendela pasang per (pelabuhan, ambang elevasi) dari tidal_rules.csv.
+
+    Aturan dengan force_sandar=true tidak menunda kapal kecuali enforce_forced=True.
+    Deret dibaca dari TidalStore; hasil konstruksi jendela di-cache ke .npy
+    (default <tidal_dir>/.cache) dan dibangun ulang hanya jika aturan atau isi
+    file pasang berubah.
+    """
+    def __init__(self, tidal_dir='Data/Tidal', rules_path='Data/tidal_rules.csv',
+                 cache_dir=None, enforce_forced=False, store=None):
+        rules = pd.read_csv(rules_path)
+        rules['port_name'] = rules['port_name'].str.strip().str.upper()
+        rules['ship_name'] = rules['ship_name'].str.strip().str.upper()
+        if not enforce_forced:
+            rules = rules[~rules['force_sandar'].astype(bool)]
+
+        # Satu rule per ambang unik; beberapa kapal bisa berbagi rule yang sama
+        threshold_cols = ['port_name', 'min_elevation', 'max_elevation', 'buffer_time']
+        self.thresholds = (rules[threshold_cols].drop_duplicates()
+                           .sort_values(threshold_cols).reset_index(drop=True))
+        rule_of_threshold = {tuple(row): i for i, row in
+                             enumerate(self.thresholds.itertuples(index=False, name=None))}
+        self.rule_of = {
+            (row[0], row[4]): rule_of_threshold[tuple(row[:4])]
+            for row in rules[threshold_cols + ['ship_name']].itertuples(index=False, name=None)
+        }
+
+        self.store = store or TidalStore(tidal_dir)
+        self.cache_dir = cache_dir or os.path.join(tidal_dir, '.cache')
+        windows = self._load_or_build()
+
+        # windows: (n, 3) = [rule, start, end], urut per rule lalu waktu
+        rule_col = windows[:, 0].astype(np.int64)
+        self.tide_start = np.ascontiguousarray(windows[:, 1])
+        self.tide_end = np.ascontiguousarray(windows[:, 2])
+        self.tide_key = rule_col * TIDE_KEY_SPAN + self.tide_end
+        self.rule_count = np.bincount(rule_col, minlength=len(self.thresholds))
+
+    def _cache_path(self):
+        # Kunci cache: tabel ambang + hash isi file pasang yang dipakai (dari manifest store)
+        h = hashlib.blake2b(digest_size=8)
+        h.update(self.thresholds.to_csv(index=False).encode())
+        stored = self.store.manifest['ports']
+        for port in sorted(set(self.thresholds['port_name'])):
+            if port in stored:
+                h.update(f"{port}|{stored[port]['hash']}".encode())
+        return os.path.join(self.cache_dir, f"tide_windows_{h.hexdigest()}.npy")
+
+    def _load_or_build(self):
+        cache_path = self._cache_path()
+        if os.path.exists(cache_path):
+            return np.load(cache_path)
+
+        stored = set(self.store.ports)
+        blocks = [np.empty((0, 3))]
+        for rule, (port, lo, hi, buffer_time) in enumerate(
+                self.thresholds.itertuples(index=False, name=None)):
+            if port not in stored:
+                continue # tidak ada data pasang -> rule tanpa batasan
+            start, end = feasible_windows(*self.store.hours(port), lo, hi, buffer_time)
+            blocks.append(np.column_stack((np.full(len(start), rule), start, end)))
+        windows = np.vstack(blocks)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _save_array(cache_path, windows)
+        return windows
+
+    def rule_id(self, port_name, ship_name):
+        # -1 = tidak ada batasan pasang untuk kombinasi ini
+        return self.rule_of.get((str(port_name).strip().upper(), str(ship_name).strip().upper()), -1)
+
+    def next_entry(self, rule, t):
+        return next_entry(self.tide_key, self.tide_start, rule, t)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest deret pasang surut ke store biner")
+    parser.add_argument("--tidal-dir", default="Data/Tidal")
+    parser.add_argument("--store-dir", default=None, help="Default: <tidal-dir>/.cache/store")
+    args = parser.parse_args()
+
+    store = TidalStore(args.tidal_dir, args.store_dir, refresh=False)
+    changed = store.ingest()
+    print(f"Store: {store.store_dir}")
+    print(f"Pelabuhan: {len(store.ports)} | Di-ingest ulang: {len(changed)} {changed if changed else ''}")
+    for port in store.ports:
+        info = store.info(port)
+        print(f"  {port:<12} {info['rows']:>6} baris | format invalid: {len(info['invalid_rows'])}")
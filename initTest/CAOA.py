@@ -1,55 +1,249 @@
+import csv
+import json
+import os
 import time
 import numpy as np
 
-def CAOA(N, max_iter, lb, ub, dim, fobj, 
+def save_checkpoint(path, t, pos, energies, fitness, gBest, gBestScore, cg_curve,
+                    last_improvement=None, elapsed=0.0):
+    # Snapshot ringkas setelah iterasi ke-t selesai, termasuk state RNG global
+    # agar run yang dilanjutkan identik bit-per-bit dengan run tanpa jeda.
+    # last_improvement & elapsed ikut disimpan supaya patience/time_budget
+    # tetap dihitung dari awal run, bukan dari saat resume.
+    rng_name, rng_keys, rng_pos, rng_has_gauss, rng_gauss = np.random.get_state()
+    tmp_path = path + '.tmp.npz'
+    np.savez(
+        tmp_path,
+        iteration=t, pos=pos, energies=energies, fitness=fitness,
+        gBest=gBest, gBestScore=gBestScore, cg_curve=cg_curve[:t],
+        last_improvement=t if last_improvement is None else last_improvement, elapsed=elapsed,
+        rng_name=rng_name, rng_keys=rng_keys, rng_pos=rng_pos,
+        rng_has_gauss=rng_has_gauss, rng_gauss=rng_gauss
+    )
+    # Tulis ke file sementara lalu rename (atomic), supaya crash saat menulis
+    # tidak merusak checkpoint sebelumnya
+    os.replace(tmp_path, path)
+
+def load_checkpoint(path):
+    data = np.load(path)
+    np.random.set_state((
+        str(data['rng_name']), data['rng_keys'], int(data['rng_pos']),
+        int(data['rng_has_gauss']), float(data['rng_gauss'])
+    ))
+    return {
+        'iteration': int(data['iteration']),
+        'pos': data['pos'].copy(),
+        'energies': data['energies'].copy(),
+        'fitness': data['fitness'].copy(),
+        'gBest': data['gBest'].copy(),
+        'gBestScore': float(data['gBestScore']),
+        'cg_curve': data['cg_curve'].copy(),
+        # Checkpoint lama (tanpa field ini): hitung dari iterasi checkpoint
+        'last_improvement': int(data['last_improvement']) if 'last_improvement' in data else int(data['iteration']),
+        'elapsed': float(data['elapsed']) if 'elapsed' in data else 0.0
+    }
+
+# ==========================================
+# INSTRUMENTASI (SINK TRACE PER ITERASI)
+# ==========================================
+# Sink menerima satu dict per iterasi lewat record(row). Jika trace=None,
+# CAOA tidak membuat dict maupun membaca timer apa pun.
+class MemorySink:
+    def __init__(self):
+        self.records = []
+
+    def record(self, row):
+        self.records.append(row)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JsonlSink(MemorySink):
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w')
+
+    def record(self, row):
+        self._file.write(json.dumps(row) + "\n")
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+class CsvSink(MemorySink):
+    # Header diambil dari baris pertama
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w', newline='')
+        self._writer = None
+
+    def record(self, row):
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(row))
+            self._writer.writeheader()
+        self._writer.writerow(row)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+def make_sink(path):
+    # None -> MemorySink, *.csv -> CsvSink, selain itu JSON Lines
+    if path is None:
+        return MemorySink()
+    if path.endswith('.csv'):
+        return CsvSink(path)
+    return JsonlSink(path)
+
+def _no_clock():
+    return 0.0
+
+def CAOA_iter(N, max_iter, lb, ub, dim, fobj, 
          alpha=0.5, beta=0.1, gamma=0.1, delta=1e-4, initial_energy=100.0,
-         verbose_interval=100):
+         verbose_interval=100, fobj_batch=None,
+         checkpoint_path=None, checkpoint_every=0, resume_from=None,
+         callback=None, verbose=True, seeds=None, seed_fraction=0.0,
+         time_budget=None, patience=None, rel_tol=None, window=50, target=None,
+         trace=None):
+    # Bentuk generator dari CAOA: yield snapshot ringan setiap akhir iterasi
+    #   {'iter', 'best', 'best_pos', 'n_depleted', 'improved', 'elapsed'}
+    # best_pos adalah referensi ke gBest (bukan salinan) -> jangan diubah in-place;
+    # gBest selalu diganti objek baru saat membaik, jadi snapshot lama tetap valid.
+    # Nilai return generator (StopIteration.value) = (gBestScore, gBest, cg_curve, info).
+    # fobj       : f(x) -> float, dipanggil per agen (fallback)
+    # fobj_batch : f(X) -> array (n,), menerima matriks kandidat (n, dim) sekaligus
+    #              sehingga fungsi objektif bisa vektorisasi/paralel secara internal
+    # Jika objektif punya cache_info() (mis. TardinessCache / functools.lru_cache),
+    # jumlah hit/miss cache ikut ditampilkan di tabel verbose.
+    # checkpoint_path / checkpoint_every : simpan snapshot .npz setiap K iterasi
+    #              (checkpoint_every=0 -> hanya di iterasi terakhir / saat berhenti dini)
+    # resume_from : lanjutkan run dari file checkpoint (bit-for-bit, RNG ikut dipulihkan;
+    #              patience & time_budget dihitung sejak awal run, bukan sejak resume)
+    # callback(t, pos, fitness, energies) : dipanggil tiap iterasi sebelum update global best;
+    #              boleh mengubah pos/fitness/energies in-place (mis. migrasi antar pulau)
+    # verbose    : False untuk mematikan tabel progres
+    # seeds      : matriks (k, dim) vektor heuristik (warm start, mis. aturan dispatching).
+    #              round(seed_fraction*N) agen awal diganti seed (seed ke-k+1 dst. = seed
+    #              + noise beta), dan agen depleted di-respawn dari seed dengan peluang seed_fraction
+    # Kriteria berhenti dini (semua opsional, dicek setiap akhir iterasi):
+    #   time_budget : batas wall-clock (detik)
+    #   patience    : berhenti jika gBestScore tidak membaik selama `patience` iterasi
+    #   rel_tol     : berhenti jika perbaikan relatif gBestScore selama `window` iterasi < rel_tol
+    #   target      : berhenti begitu gBestScore <= target (mis. baseline * (1 - X/100))
+    # cg_curve selalu sepanjang iterasi yang benar-benar dijalankan
+    # trace      : sink (MemorySink / JsonlSink / CsvSink) yang menerima satu baris per iterasi:
+    #              waktu fase (move, eval, worse, respawn, callback), jumlah panggilan objektif,
+    #              kandidat dievaluasi, hit/miss cache, dan statistik energi
+    if fobj is None and fobj_batch is None:
+        raise ValueError("fobj atau fobj_batch harus diberikan")
     
     if np.isscalar(lb): lb = np.full(dim, lb)
     else: lb = np.array(lb)
     if np.isscalar(ub): ub = np.full(dim, ub)
     else: ub = np.array(ub)
     
-    pos = lb + (ub - lb) * np.random.rand(N, dim)
-    energies = initial_energy * np.ones(N)
-    fitness = np.zeros(N)
+    cache_info = getattr(fobj_batch, 'cache_info', None) or getattr(fobj, 'cache_info', None)
+    
+    counts = [0, 0] # [panggilan objektif, kandidat dievaluasi]
+    def evaluate(candidates):
+        counts[0] += 1
+        counts[1] += len(candidates)
+        if fobj_batch is not None:
+            return np.asarray(fobj_batch(candidates), dtype=float)
+        return np.array([fobj(x) for x in candidates], dtype=float)
+    
+    if seeds is not None:
+        seeds = np.clip(np.atleast_2d(np.asarray(seeds, dtype=float)), lb, ub)
+        if seeds.shape[1] != dim:
+            raise ValueError(f"Seed berdimensi {seeds.shape[1]}, bukan {dim}")
+
+    def seeded(n, exact=True):
+        # n vektor dari seed; yang tidak persis seed diberi noise sebesar langkah beta
+        idx = np.arange(n) % len(seeds) if exact else np.random.randint(len(seeds), size=n)
+        out = seeds[idx].copy()
+        jitter = np.arange(n) >= len(seeds) if exact else np.ones(n, dtype=bool)
+        if np.any(jitter):
+            out[jitter] += beta * (1.0 - 2.0 * np.random.rand(np.sum(jitter), dim))
+        return np.clip(out, lb, ub)
     
-    for i in range(N):
-        fitness[i] = fobj(pos[i, :])
-        
-    best_idx = np.argmin(fitness)
-    gBestScore = fitness[best_idx]
-    gBest = pos[best_idx, :].copy()
     cg_curve = np.zeros(max_iter)
+    if resume_from is not None:
+        state = load_checkpoint(resume_from)
+        if state['pos'].shape != (N, dim):
+            raise ValueError(f"Checkpoint berukuran {state['pos'].shape}, bukan ({N}, {dim})")
+        t_start = state['iteration']
+        pos, energies, fitness = state['pos'], state['energies'], state['fitness']
+        gBest, gBestScore = state['gBest'], state['gBestScore']
+        cg_curve[:t_start] = state['cg_curve'][:max_iter]
+        last_improvement, elapsed_before = state['last_improvement'], state['elapsed']
+        if verbose:
+            print(f"Melanjutkan dari checkpoint '{resume_from}' (iterasi {t_start})")
+    else:
+        t_start = 0
+        last_improvement, elapsed_before = 0, 0.0
+        pos = lb + (ub - lb) * np.random.rand(N, dim)
+        n_seeded = min(N, int(round(seed_fraction * N))) if seeds is not None else 0
+        if n_seeded > 0:
+            pos[:n_seeded] = seeded(n_seeded)
+        energies = initial_energy * np.ones(N)
+        fitness = evaluate(pos)
+        
+        best_idx = np.argmin(fitness)
+        gBestScore = fitness[best_idx]
+        gBest = pos[best_idx, :].copy()
     
     # Header Verbose
-    print(f"{'Iter':<10} | {'Runtime (s)':<12} | {'Depleted':<10} | {'Pop Size':<10} | {'Best Fitness':<20}")
-    print("-" * 80)
+    header = f"{'Iter':<10} | {'Runtime (s)':<12} | {'Depleted':<10} | {'Pop Size':<10} | {'Best Fitness':<20}"
+    if cache_info is not None:
+        header += f" | {'Cache Hit':<10} | {'Cache Miss':<10}"
+    if verbose:
+        print(header)
+        print("-" * max(80, len(header)))
     
-    start_time = time.time()
+    clock = time.perf_counter if trace is not None else _no_clock
+    start_time = time.time() - elapsed_before # waktu run sebelum resume ikut dihitung
+    stop_reason = 'max_iter'
+    t = t_start - 1
 
-    for t in range(max_iter):
+    for t in range(t_start, max_iter):
+        t0 = clock()
+        calls_before, evaluated_before = counts
         old_positions = pos.copy()
         old_fitness = fitness.copy()
         n_depleted_count = 0
+        n_worse = 0
+        improved = False
         
         probs = 1.0 / (1.0 + np.abs(fitness))
         leader_idx = np.argmax(probs)
         leader_position = pos[leader_idx, :].copy()
         
-        for i in range(N):
-            if i == leader_idx: continue
-            r = np.random.rand(dim)
-            new_pos = pos[i, :] + alpha * (leader_position - pos[i, :]) + beta * (1.0 - 2.0 * r)
-            new_pos = np.clip(new_pos, lb, ub)
-            new_fit = fobj(new_pos)
-            
-            if abs(new_fit - old_fitness[i]) > delta and new_fit > old_fitness[i]:
-                new_pos = lb + (ub - lb) * np.random.rand(dim)
-                new_fit = fobj(new_pos)
-            
-            pos[i, :] = new_pos
-            fitness[i] = new_fit
+        # Semua agen (kecuali leader) bergerak bersamaan -> satu evaluasi batch
+        movers = np.arange(N) != leader_idx
+        n_movers = np.sum(movers)
+        r = np.random.rand(n_movers, dim)
+        new_pos = pos[movers] + alpha * (leader_position - pos[movers]) + beta * (1.0 - 2.0 * r)
+        new_pos = np.clip(new_pos, lb, ub)
+        t1 = clock()
+        new_fit = evaluate(new_pos)
+        t2 = clock()
+        
+        # Agen yang memburuk diacak ulang -> satu evaluasi batch
+        worse = (np.abs(new_fit - old_fitness[movers]) > delta) & (new_fit > old_fitness[movers])
+        if np.any(worse):
+            n_worse = np.sum(worse)
+            new_pos[worse] = lb + (ub - lb) * np.random.rand(n_worse, dim)
+            new_fit[worse] = evaluate(new_pos[worse])
+        t3 = clock()
+        
+        pos[movers] = new_pos
+        fitness[movers] = new_fit
 
         distances = np.sqrt(np.sum((pos - old_positions)**2, axis=1))
         energies = energies - gamma * distances
@@ -58,10 +252,18 @@ def CAOA(N, max_iter, lb, ub, dim, fobj,
         if np.any(depleted):
             n_depleted_count = np.sum(depleted)
             random_positions = lb + (ub - lb) * np.random.rand(n_depleted_count, dim)
+            if seeds is not None and seed_fraction > 0:
+                from_seed = np.random.rand(n_depleted_count) < seed_fraction
+                if np.any(from_seed):
+                    random_positions[from_seed] = seeded(np.sum(from_seed), exact=False)
             pos[depleted, :] = random_positions
             energies[depleted] = initial_energy
-            for idx in np.where(depleted)[0]:
-                fitness[idx] = fobj(pos[idx, :])
+            fitness[depleted] = evaluate(pos[depleted, :])
+        t4 = clock()
+
+        if callback is not None:
+            callback(t, pos, fitness, energies)
+        t5 = clock()
 
         # Update Global Best
         min_fit = np.min(fitness)
@@ -69,11 +271,75 @@ def CAOA(N, max_iter, lb, ub, dim, fobj,
         if min_fit < gBestScore:
             gBestScore = min_fit
             gBest = pos[min_idx, :].copy()
+            last_improvement = t + 1
+            improved = True
             
         cg_curve[t] = gBestScore
+
+        if target is not None and gBestScore <= target:
+            stop_reason = 'target'
+        elif time_budget is not None and time.time() - start_time >= time_budget:
+            stop_reason = 'time_budget'
+        elif patience is not None and t + 1 - last_improvement >= patience:
+            stop_reason = 'patience'
+        elif rel_tol is not None and t >= window:
+            past = cg_curve[t - window]
+            if (past - gBestScore) / max(abs(past), 1e-12) < rel_tol:
+                stop_reason = 'stagnation'
+        stopping = stop_reason != 'max_iter'
+
+        if trace is not None:
+            row = {
+                'iter': t + 1, 't_move': t1 - t0, 't_eval': t2 - t1, 't_worse': t3 - t2,
+                't_respawn': t4 - t3, 't_callback': t5 - t4, 't_total': clock() - t0,
+                'n_calls': counts[0] - calls_before, 'n_evaluated': counts[1] - evaluated_before,
+                'n_worse': int(n_worse), 'n_depleted': int(n_depleted_count),
+                'best': float(gBestScore), 'mean_fitness': float(np.mean(fitness)),
+                'energy_min': float(np.min(energies)), 'energy_mean': float(np.mean(energies)),
+                'energy_max': float(np.max(energies)), 'energy_std': float(np.std(energies))
+            }
+            if cache_info is not None:
+                info = cache_info()
+                row['cache_hits'] = int(info.hits)
+                row['cache_misses'] = int(info.misses)
+            trace.record(row)
         
-        if (t + 1) % verbose_interval == 0 or t == 0:
+        if verbose and ((t + 1) % verbose_interval == 0 or t == 0 or stopping):
             elapsed = time.time() - start_time
-            print(f"{t+1:<10} | {elapsed:<12.2f} | {n_depleted_count:<10} | {N:<10} | {gBestScore:.6e}")
+            row = f"{t+1:<10} | {elapsed:<12.2f} | {n_depleted_count:<10} | {N:<10} | {gBestScore:<20.6e}"
+            if cache_info is not None:
+                info = cache_info()
+                row += f" | {info.hits:<10} | {info.misses:<10}"
+            print(row)
+        
+        periodic = checkpoint_every > 0 and (t + 1) % checkpoint_every == 0
+        if checkpoint_path and (periodic or t + 1 == max_iter or stopping):
+            save_checkpoint(checkpoint_path, t + 1, pos, energies, fitness, gBest, gBestScore, cg_curve,
+                            last_improvement, time.time() - start_time)
+
+        yield {'iter': t + 1, 'best': gBestScore, 'best_pos': gBest,
+               'n_depleted': int(n_depleted_count), 'improved': improved,
+               'elapsed': time.time() - start_time}
+
+        if stopping:
+            if verbose:
+                print(f"Berhenti di iterasi {t + 1}: {stop_reason}")
+            break
+
+    cg_curve = cg_curve[:t + 1] # sama dengan max_iter jika tidak berhenti dini
+    info = {'stop_reason': stop_reason, 'iterations': t + 1, 'runtime': time.time() - start_time}
+    return gBestScore, gBest, cg_curve, info
 
-    return gBestScore, gBest, cg_curve
\ No newline at end of file
+def CAOA(*args, return_info=False, **kwargs):
+    # Versi blocking: jalankan CAOA_iter sampai selesai (argumen sama)
+    # return_info : True -> return tambahan dict {stop_reason, iterations, runtime}
+    run = CAOA_iter(*args, **kwargs)
+    while True:
+        try:
+            next(run)
+        except StopIteration as stop:
+            gBestScore, gBest, cg_curve, info = stop.value
+            break
+    if not return_info:
+        return gBestScore, gBest, cg_curve
+    return gBestScore, gBest, cg_curve, info
\ No newline at end of file
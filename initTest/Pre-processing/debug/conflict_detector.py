@@ -1,7 +1,23 @@
+import argparse
+import os
+import sys
 import pandas as pd
-from datetime import timedelta
+import numpy as np
 
-def detect_clashes(voyage_file, port_file, output_file='conflict_report.csv'):
+# caoa_solver.py ada di folder initTest (dua tingkat di atas folder ini)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from caoa_solver import capacity_conflicts, BerthIntervalIndex
+
+# --- ATURAN WAKTU SAMA (TIE RULE) ---
+# Default sekarang: pada waktu yang sama PERGI diproses sebelum DATANG, jadi kapal
+# yang berangkat tepat saat kapal lain datang TIDAK dihitung konflik (sama dengan
+# decoder caoa_solver). Versi lama memproses event sesuai urutan baris sehingga
+# melaporkan lebih banyak titik (Data/voyage_data_all.csv: 730 titik lama vs 558).
+# Laporan dengan aturan berbeda tidak bisa dibandingkan langsung; pakai
+# --tie-rule legacy untuk mereproduksi laporan lama.
+TIE_RULES = ('depart-first', 'legacy')
+
+def detect_clashes(voyage_file, port_file, output_file='conflict_report.csv', tie_rule='depart-first'):
     # 1. Load Data
     print("Memuat data...")
     voyages = pd.read_csv(voyage_file)
@@ -17,57 +33,39 @@ def detect_clashes(voyage_file, port_file, output_file='conflict_report.csv'):
     # Buat Dictionary Kapasitas: {'TANJUNG PRIOK': 5, ...}
     port_caps = dict(zip(ports['Nama_Pelabuhan'], ports['Total_Berths']))
     
-    clash_log = []
+    # 2. Sweep-line semua pelabuhan sekaligus (waktu dalam int64 ns)
+    # Event diurutkan per (pelabuhan, waktu); urutan pada waktu yang sama mengikuti tie_rule
+    port_code, port_names = pd.factorize(voyages['Port_Name'])
+    capacity = np.array([port_caps.get(p, 1) for p in port_names]) # Default 1 jika tidak ada di data port
+    start = voyages['ETA_Planned'].values.astype('datetime64[ns]').astype(np.int64)
+    end = voyages['ETD_Planned'].values.astype('datetime64[ns]').astype(np.int64)
     
-    # 2. Iterasi Per Pelabuhan
-    unique_ports = voyages['Port_Name'].unique()
+    print(f"Aturan waktu sama: {tie_rule}")
+    event_row, event_delta, occupancy = capacity_conflicts(port_code, start, end, capacity,
+                                                           departures_first=(tie_rule == 'depart-first'))
+    event_port = port_code[event_row]
+    event_time = np.where(event_delta > 0, start[event_row], end[event_row])
     
-    for port in unique_ports:
-        # Ambil semua kunjungan ke pelabuhan ini
-        visits = voyages[voyages['Port_Name'] == port].copy()
-        
-        # Ambil kapasitas (Default 1 jika tidak ada di data port)
-        cap = port_caps.get(port, 1)
-        
-        # --- ALGORITMA SWEEP LINE ---
-        # Kita ubah setiap kunjungan menjadi 2 event: DATANG (+1) dan PERGI (-1)
-        timeline = []
-        for idx, row in visits.iterrows():
-            timeline.append((row['ETA_Planned'], 1, row['Ship_Name'], row['Voyage_ID']))
-            timeline.append((row['ETD_Planned'], -1, row['Ship_Name'], row['Voyage_ID']))
-            
-        # Urutkan timeline berdasarkan waktu
-        timeline.sort(key=lambda x: x[0])
-        
-        current_occupancy = 0
-        active_ships = []
-        
-        for time_point, change, ship, voy_id in timeline:
-            if change == 1: # Kapal Datang
-                current_occupancy += 1
-                active_ships.append(f"{ship}({voy_id})")
-            else: # Kapal Pergi
-                current_occupancy -= 1
-                if f"{ship}({voy_id})" in active_ships:
-                    active_ships.remove(f"{ship}({voy_id})")
-            
-            # --- CEK KONFLIK ---
-            if current_occupancy > cap:
-                # KONFLIK TERDETEKSI!
-                # Jumlah kapal > Jumlah Berth
-                clash_log.append({
-                    'Port': port,
-                    'Time_Start': time_point,
-                    'Occupancy': current_occupancy,
-                    'Capacity': cap,
-                    'Ships_Involved': " | ".join(active_ships)
-                })
+    # --- KAPAL YANG TERLIBAT ---
+    # Hanya untuk titik konflik: query interval index "siapa yang sandar pada waktu t"
+    index = BerthIntervalIndex(port_code, start, end)
+    labels = (voyages['Ship_Name'].astype(str) + "(" + voyages['Voyage_ID'].astype(str) + ")").to_numpy()
+    
+    clash_log = []
+    for p, t, occ in zip(event_port, event_time, occupancy):
+        clash_log.append({
+            'Port': port_names[p],
+            'Time_Start': pd.Timestamp(int(t)),
+            'Occupancy': int(occ),
+            'Capacity': int(capacity[p]),
+            'Ships_Involved': " | ".join(labels[index.overlap(p, t, t + 1)])
+        })
 
     # 3. Simpan Laporan
     if len(clash_log) > 0:
         report_df = pd.DataFrame(clash_log)
         report_df.to_csv(output_file, index=False)
-        print(f"\n[BAHAYA] Ditemukan {len(report_df)} titik konflik!")
+        print(f"\n[BAHAYA] Ditemukan {len(report_df)} titik konflik! (aturan: {tie_rule})")
         print(f"Laporan detail disimpan di: {output_file}")
         
         # Tampilkan preview
@@ -79,7 +77,13 @@ def detect_clashes(voyage_file, port_file, output_file='conflict_report.csv'):
         return False # Tidak ada konflik
 
 if __name__ == "__main__":
-    # Jalankan deteksi
     # Pastikan nama file sesuai dengan file CSV Anda
-    # has_conflict = detect_clashes('voyage_data.csv', 'port_data.csv')
-    has_conflict = detect_clashes('voyage_data_all.csv', 'port_data.csv')
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Deteksi konflik kapasitas berth (sweep-line)")
+    parser.add_argument("voyages", nargs="?", default="voyage_data_all.csv")
+    parser.add_argument("ports", nargs="?", default="port_data.csv")
+    parser.add_argument("--output", default="conflict_report.csv")
+    parser.add_argument("--tie-rule", choices=TIE_RULES, default="depart-first",
+                        help="Urutan event pada waktu yang sama (legacy = perilaku versi lama)")
+    args = parser.parse_args()
+
+    has_conflict = detect_clashes(args.voyages, args.ports, args.output, args.tie_rule)
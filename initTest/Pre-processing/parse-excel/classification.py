@@ -5,6 +5,78 @@ import os
 INPUT_CSV = 'voyage_data_all.csv'  # Pastikan ini nama file output dari tahap sebelumnya
 OUTPUT_DIR = 'Split_By_Month'        # Folder untuk menyimpan hasil pecahan
 
+VOYAGE_KEYS = ['Ship_Name', 'Voyage_ID']
+SORT_KEYS = ['Ship_Name', 'Voyage_ID', 'Leg_Sequence']
+
+# Fungsi untuk mencari modus (nilai terbanyak) dari bulan dalam satu grup
+def get_majority_period(x):
+    # Ambil semua periode valid dalam satu voyage
+    periods = x.dropna()
+    if periods.empty:
+        return "Unknown"
+    # Kembalikan periode yang paling sering muncul (Mode)
+    # Jika seri, ambil yang pertama
+    return periods.mode()[0]
+
+def month_label(month):
+    # Period('2025-01') -> '2025_01' (bagian nama file Voyage_Data_*.csv)
+    return "Unknown_Date" if str(month) == "Unknown" else str(month).replace('-', '_')
+
+def voyage_months(df):
+    # {(Ship_Name, Voyage_ID): label bulan} dengan aturan majority voting yang sama
+    if df.empty:
+        return {}
+    period = pd.to_datetime(df['ETA_Planned'], errors='coerce').dt.to_period('M')
+    majority = period.groupby([df['Ship_Name'], df['Voyage_ID']]).apply(get_majority_period)
+    return {key: month_label(month) for key, month in majority.items()}
+
+def voyage_mask(df, keys):
+    # Baris yang (Ship_Name, Voyage_ID)-nya ada di keys
+    return pd.MultiIndex.from_frame(df[VOYAGE_KEYS]).isin(list(keys))
+
+def update_month_split(df, output_folder, keys, old_months):
+    """
+    Split inkremental: hanya file bulan yang memuat voyage di `keys`
+    (bulan lama menurut old_months dan bulan baru hasil voting) yang ditulis ulang.
+
+    df: jadwal lengkap terbaru; Return {voyage: label bulan} untuk `keys`.
+    """
+    keys = set(keys)
+    new_months = voyage_months(df[voyage_mask(df, keys)])
+    months = {old_months[k] for k in keys if k in old_months} | set(new_months.values())
+    os.makedirs(output_folder, exist_ok=True)
+
+    for month in sorted(months):
+        save_path = os.path.join(output_folder, f"Voyage_Data_{month}.csv")
+        parts = []
+        if os.path.exists(save_path):
+            current = pd.read_csv(save_path, keep_default_na=False, na_values=[''])
+            parts.append(current[~voyage_mask(current, keys)])
+        moved_in = [k for k, m in new_months.items() if m == month]
+        parts.append(df[voyage_mask(df, moved_in)])
+        subset = pd.concat(parts).sort_values(by=SORT_KEYS, kind='stable')
+
+        if subset.empty:
+            if os.path.exists(save_path):
+                os.remove(save_path)
+            print(f"  -> Dihapus: {os.path.basename(save_path)} (kosong)")
+            continue
+        subset.to_csv(save_path, index=False)
+        print(f"  -> Diperbarui: {os.path.basename(save_path)} ({len(subset)} baris)")
+    return new_months
+
+def rebuild_month_split(df, output_folder):
+    """
+    Split penuh ke folder yang dikosongkan dulu, sehingga file bulan lama (termasuk
+    voyage yang sudah tidak ada di data) tidak tersisa. Return {voyage: label bulan}.
+    """
+    if os.path.isdir(output_folder):
+        for name in os.listdir(output_folder):
+            if name.startswith('Voyage_Data_') and name.endswith('.csv'):
+                os.remove(os.path.join(output_folder, name))
+    keys = set(zip(df['Ship_Name'], df['Voyage_ID']))
+    return update_month_split(df, output_folder, keys, {})
+
 def classify_and_split(input_file, output_folder):
     print(f"Membaca data dari: {input_file}...")
     
@@ -26,16 +98,6 @@ def classify_and_split(input_file, output_folder):
     print("Melakukan klasifikasi Majority Voting per Voyage...")
 
     # 3. Algoritma Majority Voting
-    # Fungsi untuk mencari modus (nilai terbanyak) dari bulan dalam satu grup
-    def get_majority_period(x):
-        # Ambil semua periode valid dalam satu voyage
-        periods = x.dropna()
-        if periods.empty:
-            return "Unknown"
-        # Kembalikan periode yang paling sering muncul (Mode)
-        # Jika seri, ambil yang pertama
-        return periods.mode()[0]
-
     # Group by Ship & Voyage, lalu cari bulan dominannya
     voyage_majority_map = df.groupby(['Ship_Name', 'Voyage_ID'])['Period'].apply(get_majority_period)
     
@@ -2,22 +2,43 @@ import pandas as pd
 import re
 import os
 import datetime
+import argparse
+import hashlib
+import json
+import zipfile
+import multiprocessing as mp
+import numpy as np
+
+from classification import VOYAGE_KEYS, SORT_KEYS, voyage_mask, update_month_split, rebuild_month_split
 
 # --- KONFIGURASI INPUT & OUTPUT ---
 INPUT_EXCEL_FILE = 'HITUNGAN EMPLOOI 2025 (FIX RILIS).xlsx'
 OUTPUT_CSV_FILE = 'Jadwal_Kapal_Final_Fixed.csv'
+SPLIT_DIR = 'Split_By_Month'
+CACHE_VERSION = 1
+
+ROW_COLUMNS = ['Ship_Name', 'Voyage_ID', 'Leg_Sequence', 'Port_Name', 'ETA_Planned', 'Service_Time_Hours']
+OUTPUT_COLUMNS = ROW_COLUMNS + ['Next_Port']
+
+# Regex dikompilasi sekali (dipakai untuk setiap baris setiap sheet)
+WHITESPACE_RE = re.compile(r'\s+')
+SHIP_RE = re.compile(r"(KM|KFC)\.?\s*([A-Z\s\.]+)", re.IGNORECASE)
+SHIP_VOYAGE_SUFFIX_RE = re.compile(r"\s+VOYAGE.*", re.IGNORECASE)
+VOYAGE_RE = re.compile(r"VOYAGE\s*([\w\.\s\(\)]+)", re.IGNORECASE)
+VOYAGE_NUMBER_RE = re.compile(r"(\d{1,2})[\._](\d{4})")
+TIME_RE = re.compile(r'(\d{1,2})[:](\d{2})')
 
 def clean_ship_name(text):
     """Membersihkan nama kapal dengan penanganan spasi ganda."""
     if not isinstance(text, str): return None
     # Hapus spasi berlebih (misal: "KM  AWU" -> "KM AWU")
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_RE.sub(' ', text).strip()
     
-    match = re.search(r"(KM|KFC)\.?\s*([A-Z\s\.]+)", text, re.IGNORECASE)
+    match = SHIP_RE.search(text)
     if match:
         name = match.group(2).strip()
         name = name.replace('.', '')
-        name = re.sub(r"\s+VOYAGE.*", "", name, flags=re.IGNORECASE)
+        name = SHIP_VOYAGE_SUFFIX_RE.sub("", name)
         return f"KM {name}"
         
     if "VOYAGE" not in text and len(text) > 3 and text.isupper():
@@ -26,10 +47,10 @@ def clean_ship_name(text):
 
 def extract_voyage_id(text):
     if not isinstance(text, str): return None
-    match = re.search(r"VOYAGE\s*([\w\.\s\(\)]+)", text, re.IGNORECASE)
+    match = VOYAGE_RE.search(text)
     if match:
         raw_voy = match.group(1).strip()
-        simple_id = re.search(r"(\d{1,2})[\._](\d{4})", raw_voy)
+        simple_id = VOYAGE_NUMBER_RE.search(raw_voy)
         if simple_id:
             return f"VOY_{simple_id.group(1).zfill(2)}_{simple_id.group(2)}"
         return f"VOY_{raw_voy.replace(' ', '_').replace('.', '_')}"
@@ -41,9 +62,12 @@ def normalize_date_time(date_val, time_val):
         return None
 
     try:
-        # 1. Parse Tanggal
-        date_obj = pd.to_datetime(date_val, errors='coerce')
-        if pd.isna(date_obj): return None
+        # 1. Parse Tanggal (sel tanggal Excel sudah berupa datetime)
+        if isinstance(date_val, datetime.datetime):
+            date_obj = date_val
+        else:
+            date_obj = pd.to_datetime(date_val, errors='coerce')
+            if pd.isna(date_obj): return None
         date_str = date_obj.strftime('%Y-%m-%d')
 
         # 2. Parse Jam
@@ -56,7 +80,7 @@ def normalize_date_time(date_val, time_val):
             # Ganti titik dengan titik dua (12.00 -> 12:00)
             t_str = t_str.replace('.', ':')
             # Cek pola HH:MM
-            time_match = re.search(r'(\d{1,2})[:](\d{2})', t_str)
+            time_match = TIME_RE.search(t_str)
             if time_match:
                 h, m = time_match.groups()
                 time_str = f"{int(h):02d}:{int(m):02d}:00"
@@ -67,7 +91,35 @@ def normalize_date_time(date_val, time_val):
     except:
         return None
 
-def process_single_sheet(df, sheet_name):
+def _cell(row, idx):
+    # Sel kosong / di luar panjang baris -> None
+    return row[idx] if idx is not None and idx < len(row) else None
+
+def _row_text(row):
+    # Setara df.iloc[i].dropna().astype(str).tolist()
+    return [str(v) for v in row if v is not None]
+
+def _normalize_cell(value):
+    # Samakan dengan pembacaan pd.read_excel: angka bulat -> int, string kosong -> None
+    if value is None: return None
+    if isinstance(value, float):
+        if value != value: return None
+        if value.is_integer(): return int(value)
+    if isinstance(value, str) and value == '': return None
+    return value
+
+def _get_col_idx(keyword, row):
+    # Cari kolom di baris header utama
+    for idx, val in enumerate(row):
+        if isinstance(val, str) and keyword in val.upper(): return idx
+    return None
+
+def process_sheet_rows(rows, sheet_name):
+    """
+    Ekstraksi jadwal dari iterator baris (tuple nilai sel) satu sheet.
+    Baris dibaca satu kali secara berurutan; hanya satu baris yang bisa
+    "dikembalikan" ke stream (lookahead subheader / baris penutup tabel).
+    """
     data_rows = []
     current_ship = None
     current_voyage = None
@@ -78,10 +130,17 @@ def process_single_sheet(df, sheet_name):
     elif sheet_name.upper() not in ['SHEET1', 'REKAP']:
          current_ship = f"KM {sheet_name.strip()}"
 
-    i = 0
-    while i < len(df):
-        row_values = df.iloc[i].dropna().astype(str).tolist()
-        row_str = " ".join(row_values)
+    rows = iter(rows)
+    pushed = []
+    def next_row():
+        if pushed: return pushed.pop()
+        row = next(rows, None)
+        return None if row is None else tuple(_normalize_cell(v) for v in row)
+
+    while True:
+        row = next_row()
+        if row is None: break
+        row_str = " ".join(_row_text(row))
         
         # 1. Metadata Detection
         new_ship = clean_ship_name(row_str)
@@ -92,44 +151,30 @@ def process_single_sheet(df, sheet_name):
         # 2. Header Detection
         if "PELABUHAN" in row_str.upper() and "NO" in row_str.upper():
             col_map = {}
-            header_row = df.iloc[i]
-            
-            # Helper cari kolom di baris header utama
-            def get_col_idx(keyword, row_series):
-                for idx, val in row_series.items():
-                    if isinstance(val, str) and keyword in val.upper(): return idx
-                return None
-            
-            col_map['no'] = get_col_idx("NO", header_row)
-            col_map['port'] = get_col_idx("PELABUHAN", header_row)
-            col_map['svc_time'] = get_col_idx("JAM LABUH", header_row) or get_col_idx("LABUH", header_row)
+            col_map['no'] = _get_col_idx("NO", row)
+            col_map['port'] = _get_col_idx("PELABUHAN", row)
+            col_map['svc_time'] = _get_col_idx("JAM LABUH", row) or _get_col_idx("LABUH", row)
             
             # --- LOGIKA STRICT ETA MAPPING ---
-            eta_root_idx = get_col_idx("ETA", header_row)
+            eta_root_idx = _get_col_idx("ETA", row)
             has_subheader = False
             
-            if i + 1 < len(df):
-                subheader_row = df.iloc[i+1]
-                subheader_str = " ".join(subheader_row.dropna().astype(str).tolist()).upper()
+            subheader_row = next_row()
+            if subheader_row is not None:
+                subheader_str = " ".join(_row_text(subheader_row)).upper()
                 
                 if "HARI" in subheader_str or "TANGGAL" in subheader_str:
                     has_subheader = True
                     
                     if eta_root_idx is not None:
-                        # Kita harus mencari Tanggal dan Jam milik ETA saja.
                         # ETA (Arrival) selalu duluan sebelum ETD (Departure).
                         # Jadi kita cari kolom Tanggal & Jam PERTAMA setelah kolom ETA Header.
-                        
-                        start_pos = df.columns.get_loc(eta_root_idx)
                         found_date = False
                         found_time = False
                         
                         # Loop hanya 5 kolom ke depan dari posisi ETA
-                        for offset in range(5): 
-                            if start_pos + offset >= len(df.columns): break
-                            
-                            curr_col = df.columns[start_pos + offset]
-                            val = str(subheader_row[curr_col]).upper()
+                        for curr_col in range(eta_root_idx, min(eta_root_idx + 5, len(row))):
+                            val = str(_cell(subheader_row, curr_col)).upper()
                             
                             # Ambil Tanggal pertama yang ketemu
                             if "TANGGAL" in val and not found_date:
@@ -141,41 +186,43 @@ def process_single_sheet(df, sheet_name):
                                 col_map['eta_time'] = curr_col
                                 found_time = True
                             
-                            # Jika sudah ketemu sepasang, berhenti loop. 
-                            # Ini mencegah terambilnya kolom ETD.
                             if found_date and found_time:
                                 break
 
             # 3. Data Extraction Loop
             if col_map.get('no') is not None and col_map.get('port') is not None:
-                data_start_idx = i + 2 if has_subheader else i + 1
+                # Tanpa subheader, baris setelah header sudah merupakan data
+                if not has_subheader and subheader_row is not None:
+                    pushed.append(subheader_row)
                 
-                j = data_start_idx
-                while j < len(df):
-                    data_row = df.iloc[j]
+                while True:
+                    data_row = next_row()
+                    if data_row is None: break
                     
                     try:
-                        no_val = data_row[col_map['no']]
-                        if pd.isna(no_val) or str(no_val).strip() == '': break 
+                        no_val = _cell(data_row, col_map['no'])
+                        if no_val is None or str(no_val).strip() == '': raise ValueError
                         leg_seq = int(float(no_val))
-                    except: break 
+                    except:
+                        # Baris penutup tabel diperiksa ulang sebagai metadata/header
+                        pushed.append(data_row)
+                        break
                     
-                    port_name = data_row[col_map['port']]
-                    if pd.isna(port_name): 
-                        j += 1; continue
+                    port_name = _cell(data_row, col_map['port'])
+                    if port_name is None: continue
                     
                     svc_time = 0.0
                     if col_map['svc_time'] is not None:
                         try:
-                            val = data_row[col_map['svc_time']]
-                            svc_time = float(val) if pd.notna(val) else 0.0
+                            val = _cell(data_row, col_map['svc_time'])
+                            svc_time = float(val) if val is not None else 0.0
                         except: pass
                     
                     # Ambil ETA
                     eta_planned = None
                     if 'eta_date' in col_map and 'eta_time' in col_map:
-                        d = data_row[col_map['eta_date']]
-                        t = data_row[col_map['eta_time']]
+                        d = _cell(data_row, col_map['eta_date'])
+                        t = _cell(data_row, col_map['eta_time'])
                         eta_planned = normalize_date_time(d, t)
 
                     if current_ship and current_voyage:
@@ -187,58 +234,320 @@ def process_single_sheet(df, sheet_name):
                             'ETA_Planned': eta_planned,
                             'Service_Time_Hours': svc_time
                         })
-                    
-                    j += 1
-                i = j - 1 
-        i += 1
+            elif subheader_row is not None:
+                pushed.append(subheader_row)
         
     return data_rows
 
-def main_pipeline():
-    print(f"Membaca file Excel: {INPUT_EXCEL_FILE}...")
-    if not os.path.exists(INPUT_EXCEL_FILE):
-        print("Error: File tidak ditemukan.")
+def process_single_sheet(df, sheet_name):
+    # Antarmuka lama: DataFrame hasil pd.read_excel(header=None)
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    return process_sheet_rows(rows, sheet_name)
+
+def is_schedule_sheet(sheet_name):
+    # Skip sheet rekap/kosong
+    return not (sheet_name.upper() == 'REKAP' or 'SHEET' in sheet_name.upper())
+
+_worker_wb = None
+
+def _init_worker(excel_file):
+    # Workbook read-only dibuka SEKALI per proses; sheet dibaca lazy per baris
+    global _worker_wb
+    from openpyxl import load_workbook
+    _worker_wb = load_workbook(excel_file, read_only=True, data_only=True)
+
+def _hashed_rows(rows, digest):
+    # Fingerprint nilai sel dihitung pada pass yang sama dengan ekstraksi
+    for row in rows:
+        digest.update(repr(row).encode())
+        yield row
+
+def _parse_sheet(sheet_name):
+    digest = hashlib.blake2b(digest_size=16)
+    rows = _hashed_rows(_worker_wb[sheet_name].iter_rows(values_only=True), digest)
+    return sheet_name, process_sheet_rows(rows, sheet_name), digest.hexdigest()
+
+def list_schedule_sheets(excel_file):
+    # {nama sheet: path XML di dalam arsip xlsx} sesuai urutan workbook
+    from openpyxl import load_workbook
+    wb = load_workbook(excel_file, read_only=True)
+    sheets = {ws.title: getattr(ws, '_worksheet_path', None)
+              for ws in wb.worksheets if is_schedule_sheet(ws.title)}
+    wb.close()
+    return sheets
+
+def iter_sheet_rows(excel_file, workers=None, sheet_names=None):
+    """
+    Parse sheet jadwal secara paralel (satu task per sheet).
+    Yield (sheet_name, rows, value_hash) sesuai urutan sheet, segera setelah
+    sheet tersebut selesai, tanpa pernah memuat seluruh workbook ke DataFrame.
+    """
+    if sheet_names is None:
+        sheet_names = list(list_schedule_sheets(excel_file))
+    if not sheet_names:
         return
 
-    try:
-        xls = pd.read_excel(INPUT_EXCEL_FILE, sheet_name=None, header=None)
-    except Exception as e:
-        print(f"Error membuka file Excel: {e}")
+    workers = max(1, min(workers or mp.cpu_count(), len(sheet_names)))
+    if workers == 1:
+        global _worker_wb
+        _init_worker(excel_file)
+        try:
+            yield from map(_parse_sheet, sheet_names)
+        finally:
+            _worker_wb.close()
+            _worker_wb = None
         return
+    with mp.Pool(workers, initializer=_init_worker, initargs=(excel_file,)) as pool:
+        yield from pool.imap(_parse_sheet, sheet_names)
 
-    all_data = []
-    for sheet_name, df in xls.items():
-        # Skip sheet rekap/kosong
-        if sheet_name.upper() == 'REKAP' or 'SHEET' in sheet_name.upper(): continue
-        
-        print(f"Memproses Sheet: {sheet_name}")
-        rows = process_single_sheet(df, sheet_name)
-        if rows: all_data.extend(rows)
+def _rows_frame(rows):
+    return pd.DataFrame(rows, columns=ROW_COLUMNS)
 
-    if not all_data:
-        print("Tidak ada data yang ditemukan.")
-        return
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
 
+def _voyage_keys(df):
+    return set(zip(df['Ship_Name'], df['Voyage_ID']))
+
+# ==========================================
+# CACHE PER SHEET (FINGERPRINT + KOLUMNAR)
+# ==========================================
+class SheetCache:
+    """
+    Cache hasil ekstraksi per sheet: <hash>.npz (satu array per kolom) dan
+    manifest.json berisi fingerprint tiap sheet.
+
+    Dua tingkat fingerprint: CRC XML sheet + sharedStrings di arsip xlsx
+    (tanpa membuka sheet) lalu hash blake2b nilai sel. Sheet yang hanya
+    berubah format/tersimpan ulang tetapi nilainya sama tidak dianggap berubah.
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        self.manifest = self._read_manifest()
+        self.changed = []
+        self.affected = set()
+
+    def _read_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == CACHE_VERSION:
+                return manifest
+        return {'version': CACHE_VERSION, 'sheets': {}, 'order': [], 'output': None, 'months': {}, 'split': None}
+
+    def _path(self, value_hash):
+        return os.path.join(self.cache_dir, f"{value_hash}.npz")
+
+    def _save_rows(self, value_hash, frame):
+        columns = {
+            'Ship_Name': frame['Ship_Name'].to_numpy(dtype=str),
+            'Voyage_ID': frame['Voyage_ID'].to_numpy(dtype=str),
+            'Leg_Sequence': frame['Leg_Sequence'].to_numpy(dtype=np.int64),
+            'Port_Name': frame['Port_Name'].to_numpy(dtype=str),
+            'ETA_Planned': frame['ETA_Planned'].fillna('').to_numpy(dtype=str), # '' = ETA kosong
+            'Service_Time_Hours': frame['Service_Time_Hours'].to_numpy(dtype=float)
+        }
+        tmp_path = self._path(value_hash) + '.tmp.npz'
+        np.savez(tmp_path, **columns)
+        os.replace(tmp_path, self._path(value_hash))
+
+    def load_rows(self, sheet_name):
+        with np.load(self._path(self.manifest['sheets'][sheet_name]['hash'])) as data:
+            frame = pd.DataFrame({name: data[name].astype(object) if data[name].dtype.kind == 'U' else data[name]
+                                  for name in ROW_COLUMNS})
+        frame['ETA_Planned'] = frame['ETA_Planned'].where(frame['ETA_Planned'] != '', None)
+        return frame
+
+    def refresh(self, excel_file, workers=None):
+        """
+        Ekstrak ulang hanya sheet yang berubah. Return daftar sheet yang berubah;
+        self.affected = voyage (Ship_Name, Voyage_ID) yang barisnya berubah.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        sheets = self.manifest['sheets']
+        current = list_schedule_sheets(excel_file)
+        with zipfile.ZipFile(excel_file) as archive:
+            crc = {info.filename: info.CRC for info in archive.infolist()}
+        strings_crc = crc.get('xl/sharedStrings.xml', 0)
+
+        quick = {}
+        for name, xml_path in current.items():
+            quick[name] = f"{crc[xml_path]:08x}-{strings_crc:08x}" if xml_path in crc else None
+        stale = [name for name in current
+                 if name not in sheets or quick[name] is None or sheets[name]['quick'] != quick[name]
+                 or not os.path.exists(self._path(sheets[name]['hash']))]
+
+        self.changed = []
+        self.affected = set()
+        for name, rows, value_hash in iter_sheet_rows(excel_file, workers, stale):
+            entry = sheets.get(name)
+            if entry and entry['hash'] == value_hash and os.path.exists(self._path(value_hash)):
+                entry['quick'] = quick[name]
+                continue
+            frame = _rows_frame(rows)
+            if entry and os.path.exists(self._path(entry['hash'])):
+                self.affected |= _voyage_keys(self.load_rows(name))
+            self.affected |= _voyage_keys(frame)
+            self._save_rows(value_hash, frame)
+            sheets[name] = {'quick': quick[name], 'hash': value_hash, 'rows': len(frame)}
+            self.changed.append(name)
+            print(f"Memproses Sheet: {name} ({len(frame)} baris)")
+
+        # Sheet yang dihapus dari workbook
+        for name in [n for n in sheets if n not in current]:
+            if os.path.exists(self._path(sheets[name]['hash'])):
+                self.affected |= _voyage_keys(self.load_rows(name))
+            del sheets[name]
+            self.changed.append(name)
+
+        self.manifest['order'] = list(current)
+        self._remove_orphans()
+        self.save()
+        return self.changed
+
+    def _remove_orphans(self):
+        used = {entry['hash'] + '.npz' for entry in self.manifest['sheets'].values()}
+        for fname in os.listdir(self.cache_dir):
+            if fname.endswith('.npz') and fname not in used:
+                os.remove(os.path.join(self.cache_dir, fname))
+
+    def all_rows(self):
+        frames = [self.load_rows(name) for name in self.manifest['order']]
+        return pd.concat(frames, ignore_index=True) if frames else _rows_frame([])
+
+    def save(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+def finalize_schedule(all_data):
     final_df = pd.DataFrame(all_data)
     
     # Logic Next Port
-    print("Menghitung Next Port...")
-    def set_next_port(group):
-        group['Next_Port'] = group['Port_Name'].shift(-1)
-        return group
+    final_df['Next_Port'] = final_df.groupby(VOYAGE_KEYS)['Port_Name'].shift(-1)
+    final_df = final_df.sort_values(by=SORT_KEYS)
+    return final_df[OUTPUT_COLUMNS]
 
-    final_df = final_df.groupby(['Ship_Name', 'Voyage_ID'], group_keys=False).apply(set_next_port)
-    final_df = final_df.sort_values(by=['Ship_Name', 'Voyage_ID', 'Leg_Sequence'])
-    
-    columns_order = ['Ship_Name', 'Voyage_ID', 'Leg_Sequence', 'Port_Name', 'ETA_Planned', 'Service_Time_Hours', 'Next_Port']
-    final_df = final_df[columns_order]
+def update_schedule(previous, rows, keys):
+    """
+    Next_Port inkremental: hanya voyage di `keys` yang dihitung ulang dari `rows`
+    (semua baris ekstraksi, urut sheet); voyage lain diambil dari jadwal lama.
+    Hasil identik dengan finalize_schedule(rows).
+    """
+    kept = previous[~voyage_mask(previous, keys)]
+    changed = rows[voyage_mask(rows, keys)]
+    if changed.empty:
+        return kept
+    merged = pd.concat([kept, finalize_schedule(changed)], ignore_index=True)
+    return merged.sort_values(by=SORT_KEYS, kind='stable')
+
+def _read_schedule(path):
+    return pd.read_csv(path, keep_default_na=False, na_values=[''])
+
+def main_pipeline(input_file=INPUT_EXCEL_FILE, output_file=OUTPUT_CSV_FILE, workers=None,
+                  cache_dir=None, split_dir=None, use_cache=True):
+    print(f"Membaca file Excel: {input_file}...")
+    if not os.path.exists(input_file):
+        print("Error: File tidak ditemukan.")
+        return
+
+    if not use_cache:
+        all_data = []
+        try:
+            for sheet_name, rows, _ in iter_sheet_rows(input_file, workers):
+                print(f"Memproses Sheet: {sheet_name} ({len(rows)} baris)")
+                all_data.extend(rows)
+        except Exception as e:
+            print(f"Error membuka file Excel: {e}")
+            return
+
+        if not all_data:
+            print("Tidak ada data yang ditemukan.")
+            return
+
+        print("Menghitung Next Port...")
+        final_df = finalize_schedule(all_data)
+        final_df.to_csv(output_file, index=False)
+        if split_dir:
+            rebuild_month_split(final_df, split_dir)
+    else:
+        cache = SheetCache(cache_dir or os.path.join(os.path.dirname(output_file) or '.', '.cache', 'sheets'))
+        try:
+            changed = cache.refresh(input_file, workers)
+        except Exception as e:
+            print(f"Error membuka file Excel: {e}")
+            return
+        print(f"Sheet berubah: {len(changed)} | Voyage terdampak: {len(cache.affected)}")
+
+        # Output lama hanya dipakai jika identik dengan yang dicatat di cache
+        output = cache.manifest['output']
+        previous_ok = (output is not None and os.path.exists(output_file)
+                       and output['hash'] == _file_digest(output_file))
+        # Split lama hanya boleh diperbarui inkremental jika dibangun dari output yang
+        # sama di folder yang sama; selain itu dibangun ulang penuh
+        split = cache.manifest.get('split')
+        split_ok = (split_dir is not None and previous_ok and split is not None
+                    and split['dir'] == os.path.abspath(split_dir) and split['output_hash'] == output['hash']
+                    and os.path.isdir(split_dir))
+        if previous_ok and not cache.affected and (split_dir is None or split_ok):
+            print(f"\nTidak ada perubahan. Output tetap: {output_file}")
+            return
+
+        if previous_ok and not cache.affected:
+            # Output sudah benar, hanya split yang perlu dibangun
+            final_df = _read_schedule(output_file)
+            keys = set()
+        else:
+            rows = cache.all_rows()
+            if rows.empty:
+                print("Tidak ada data yang ditemukan.")
+                return
+
+            print("Menghitung Next Port...")
+            if previous_ok:
+                keys = cache.affected
+                final_df = update_schedule(_read_schedule(output_file), rows, keys)
+            else:
+                keys = _voyage_keys(rows)
+                final_df = finalize_schedule(rows)
+            final_df.to_csv(output_file, index=False)
+        output_hash = _file_digest(output_file)
+
+        if split_dir:
+            if split_ok:
+                old_months = {tuple(k.split('\t')): m for k, m in cache.manifest['months'].items()}
+                new_months = update_month_split(final_df, split_dir, keys, old_months)
+                old_months = {k: m for k, m in old_months.items() if k not in keys}
+                old_months.update(new_months)
+            else:
+                print(f"Split bulanan dibangun ulang penuh: {split_dir}")
+                old_months = rebuild_month_split(final_df, split_dir)
+            cache.manifest['months'] = {'\t'.join(k): m for k, m in old_months.items()}
+            cache.manifest['split'] = {'dir': os.path.abspath(split_dir), 'output_hash': output_hash}
+        cache.manifest['output'] = {'path': os.path.basename(output_file), 'hash': output_hash}
+        cache.save()
 
-    final_df.to_csv(OUTPUT_CSV_FILE, index=False)
-    print(f"\nSukses! Data telah diekspor ke: {OUTPUT_CSV_FILE}")
+    print(f"\nSukses! Data telah diekspor ke: {output_file}")
     print("\nPreview 5 Data Teratas (Cek ETA vs ETD):")
     print(final_df.head(5).to_string())
     print("\nPreview 5 Data Terbawah (Cek Leg Terakhir):")
     print(final_df.tail(5).to_string())
 
 if __name__ == "__main__":
-    main_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Parse workbook jadwal kapal ke CSV voyage")
+    parser.add_argument("--input", default=INPUT_EXCEL_FILE)
+    parser.add_argument("--out", default=OUTPUT_CSV_FILE)
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: semua core)")
+    parser.add_argument("--cache-dir", default=None, help="Default: <folder output>/.cache/sheets")
+    parser.add_argument("--no-cache", action="store_true", help="Parse ulang semua sheet")
+    parser.add_argument("--split-dir", default=None,
+                        help=f"Perbarui juga split bulanan (mis. {SPLIT_DIR}) hanya untuk voyage yang berubah")
+    args = parser.parse_args()
+    main_pipeline(args.input, args.out, args.workers, args.cache_dir, args.split_dir,
+                  use_cache=not args.no_cache)
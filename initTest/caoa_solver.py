@@ -0,0 +1,590 @@
+import heapq
+import os
+import types
+import numpy as np
+import pandas as pd
+
+# Backend JIT opsional: aktifkan dengan CAOA_BACKEND=numba atau argumen backend='numba'.
+# Jika numba tidak terpasang, otomatis kembali ke jalur Python.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+QUEUE_WINDOW_HOURS = 24.0 # Prioritas 1.0 = maju 24 jam di antrean
+SEED_RULES = ('fcfs', 'edd', 'spt', 'least_slack') # aturan dispatching untuk warm start CAOA
+
+def resolve_backend(backend=None):
+    if backend is None:
+        backend = os.environ.get('CAOA_BACKEND', 'python')
+    backend = backend.lower()
+    if backend == 'numba' and not NUMBA_AVAILABLE:
+        return 'python'
+    return backend
+
+def hours_to_datetime(hours):
+    # Kebalikan konversi load: jam sejak epoch -> datetime64[ns] (hanya untuk laporan)
+    return pd.to_datetime(np.round(hours * 3.6e12).astype(np.int64))
+
+def _berth_layout(port_names, caps):
+    # Slot berth semua pelabuhan disimpan dalam satu array datar
+    counts = np.array([caps.get(p, 1) for p in port_names], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+    return offsets, counts
+
+# --- Status Berth: min-heap per pelabuhan dalam satu array datar ---
+def _heap_replace_top(heap, start, size, value):
+    # Ganti akar min-heap heap[start:start+size] dengan value lalu sift-down, O(log c)
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[start + child + 1] < heap[start + child]:
+            child += 1
+        if heap[start + child] >= value:
+            break
+        heap[start + i] = heap[start + child]
+        i = child
+    heap[start + i] = value
+
+def _first_free(t, duration, row, block_offset, block_start, block_end):
+    # Waktu paling awal >= t sehingga [t, t + duration) tidak beririsan dengan
+    # interval sibuk bawaan baris `row` (format CSR, terurut menurut waktu mulai)
+    for j in range(block_offset[row], block_offset[row + 1]):
+        if block_end[j] <= t:
+            continue
+        if block_start[j] >= t + duration:
+            break
+        t = block_end[j]
+    return t
+
+if NUMBA_AVAILABLE:
+    # Salinan JIT dengan nama terpisah: jalur Python tetap memanggil fungsi Python murni
+    _heap_replace_top_jit = njit(cache=True)(_heap_replace_top)
+    _first_free_jit = njit(cache=True)(_first_free)
+
+def _jit_with(func, **helpers):
+    # Kompilasi salinan func yang memanggil helper JIT (nama global diganti),
+    # tanpa mengubah func sendiri yang dipakai backend Python
+    scope = dict(func.__globals__)
+    scope.update(helpers)
+    clone = types.FunctionType(func.__code__, scope, func.__name__,
+                               func.__defaults__, func.__closure__)
+    clone.__qualname__ = func.__qualname__
+    return njit(cache=True)(clone)
+
+def voyage_arrays(voyages):
+    """
+    Konversi SEKALI saat load: waktu -> jam sejak epoch (float64), nama -> kode integer.
+    Simulator hanya bekerja pada array ini; Timestamp dibuat lagi saat menulis laporan.
+    """
+    ship_code, ship_names = pd.factorize(voyages['Ship_Name'])
+    port_code, port_names = pd.factorize(voyages['Port_Name'])
+    eta_ns = voyages['ETA_Planned'].values.astype('datetime64[ns]').astype(np.int64)
+    return {
+        'ship_code': ship_code.astype(np.int64),
+        'port_code': port_code.astype(np.int64),
+        'ship_names': np.asarray(ship_names, dtype=object),
+        'port_names': np.asarray(port_names, dtype=object),
+        'eta_ns': eta_ns,
+        'eta': eta_ns / 3.6e12,
+        'service': voyages['Service_Time_Hours'].to_numpy(dtype=float)
+    }
+
+def queue_times(arrays, priority):
+    # Prioritas tinggi -> kapal "mengantre" lebih awal dari ETA-nya (int64 ns).
+    # priority boleh 1D (satu solusi) atau 2D (satu solusi per baris)
+    priority = np.asarray(priority, dtype=float)
+    shift = pd.to_timedelta(priority.ravel() * QUEUE_WINDOW_HOURS, unit='h')
+    shift = shift.values.astype('timedelta64[ns]').astype(np.int64).reshape(priority.shape)
+    return arrays['eta_ns'] - shift
+
+def queue_order(times_ns):
+    # Argsort sebagai datetime64 (bukan int64): urutan untuk waktu yang sama
+    # identik dengan DataFrame.sort_values pada kolom tanggal
+    return np.argsort(times_ns.view('datetime64[ns]'), axis=-1, kind='quicksort')
+
+def simulate_queue(arrays, caps, order, backend=None, layout=None, blocks=None):
+    """
+    Layani kunjungan sesuai urutan `order` di berth yang paling cepat kosong.
+
+    layout: (berth_offset, berth_count) hasil _berth_layout, jika sudah dihitung.
+    blocks: interval sibuk bawaan hasil busy_blocks (mis. jadwal bulan sebelumnya).
+    Return (total_delay, actual_arrival, actual_berth); waktu dalam jam sejak epoch.
+    """
+    kernel = _priority_kernel_jit if resolve_backend(backend) == 'numba' else _priority_kernel
+    berth_offset, berth_count = layout or _berth_layout(arrays['port_names'], caps)
+    berth_free = np.full(int(berth_count.sum()), -np.inf)
+    ship_ready = np.full(len(arrays['ship_names']), -np.inf)
+    if blocks is None:
+        blocks = _no_blocks(len(berth_free), len(ship_ready))
+    actual_arrival = np.empty(len(order))
+    actual_berth = np.empty(len(order))
+
+    total_delay = kernel(
+        np.asarray(order, dtype=np.int64), arrays['ship_code'], arrays['port_code'],
+        arrays['eta'], arrays['service'], berth_free, berth_offset, berth_count,
+        ship_ready, actual_arrival, actual_berth, blocks
+    )
+    return total_delay, actual_arrival, actual_berth
+
+def run_priority_simulation(voyages, caps, priority, return_detailed=False, backend=None, arrays=None):
+    """
+    Decoder prioritas: antrean diurutkan berdasarkan Queue_Time = ETA - prioritas*24 jam,
+    lalu setiap kunjungan dilayani berth yang paling cepat kosong.
+
+    arrays: hasil voyage_arrays(voyages); berikan agar konversi tidak diulang tiap panggilan.
+    Return total delay (jam) terhadap ETA_Planned, atau DataFrame detail
+    jika return_detailed=True.
+    """
+    if arrays is None:
+        arrays = voyage_arrays(voyages)
+    priority = np.asarray(priority, dtype=float)
+    queue_time = queue_times(arrays, priority)
+    order = queue_order(queue_time)
+
+    total_delay, actual_arrival, actual_berth = simulate_queue(arrays, caps, order, backend)
+    if not return_detailed:
+        return total_delay
+    return _detailed_report(arrays, priority, queue_time, order, actual_arrival, actual_berth)
+
+def _detailed_report(arrays, priority, queue_time, order, actual_arrival, actual_berth):
+    # Satu baris per kunjungan, urut sesuai antrean; waktu dikembalikan ke datetime
+    eta, service = arrays['eta'], arrays['service']
+    return pd.DataFrame({
+        'Ship_Name': arrays['ship_names'][arrays['ship_code'][order]],
+        'Port_Name': arrays['port_names'][arrays['port_code'][order]],
+        'ETA_Planned': pd.to_datetime(arrays['eta_ns'][order]),
+        'Optimized_Priority': priority[order],
+        'Queue_Time': pd.to_datetime(queue_time[order]),
+        'Actual_Arrival': hours_to_datetime(actual_arrival[order]),
+        'Actual_Berth': hours_to_datetime(actual_berth[order]),
+        'Actual_Departure': hours_to_datetime(actual_berth[order] + service[order]),
+        'Delay_Hours': actual_berth[order] - eta[order],
+        'Waiting_Time_Hours': actual_berth[order] - actual_arrival[order]
+    })
+
+# ==========================================
+# KONFLIK BERTH (SWEEP-LINE VEKTOR + INTERVAL INDEX)
+# ==========================================
+def berth_occupancy(port_code, start, end, departures_first=True):
+    """
+    Sweep-line untuk SEMUA pelabuhan sekaligus.
+
+    Setiap kunjungan [start, end) menjadi event DATANG (+1) dan PERGI (-1),
+    diurutkan per (pelabuhan, waktu); pada waktu yang sama PERGI diproses dulu
+    sehingga kapal yang berangkat tepat saat kapal lain datang tidak dihitung
+    bentrok. Karena tiap pelabuhan net-nol, cumsum global = okupansi per pelabuhan.
+
+    departures_first=False: aturan lama conflict_detector.py, event pada waktu
+    yang sama diproses sesuai urutan baris (DATANG lalu PERGI per kunjungan).
+
+    Return (event_row, event_delta, occupancy) dalam urutan sweep;
+    event_row = indeks kunjungan pemilik event.
+    """
+    port_code = np.asarray(port_code, dtype=np.int64)
+    n = len(port_code)
+    if departures_first:
+        rows = np.concatenate((np.arange(n), np.arange(n)))
+        delta = np.concatenate((np.ones(n, dtype=np.int64), -np.ones(n, dtype=np.int64)))
+        times = np.concatenate((start, end))
+        order = np.lexsort((delta, times, np.concatenate((port_code, port_code))))
+    else:
+        # Event berselang-seling per kunjungan; lexsort stabil -> urutan baris dipertahankan
+        rows = np.repeat(np.arange(n), 2)
+        delta = np.tile(np.array([1, -1], dtype=np.int64), n)
+        times = np.column_stack((start, end)).ravel()
+        order = np.lexsort((times, port_code[rows]))
+    return rows[order], delta[order], np.cumsum(delta[order])
+
+def capacity_conflicts(port_code, start, end, capacity, departures_first=True):
+    """
+    Titik konflik: event yang membuat okupansi > kapasitas pelabuhannya.
+    capacity: array kapasitas per kode pelabuhan (mis. VoyageProblem.berth_count).
+    Return (event_row, event_delta, occupancy) hanya untuk event yang melanggar.
+    """
+    event_row, event_delta, occupancy = berth_occupancy(port_code, start, end, departures_first)
+    over = occupancy > np.asarray(capacity)[np.asarray(port_code)[event_row]]
+    return event_row[over], event_delta[over], occupancy[over]
+
+def count_capacity_violations(port_code, start, end, capacity):
+    # Jumlah event dengan okupansi > kapasitas, O(n log n) tanpa DataFrame
+    event_row, _, occupancy = berth_occupancy(port_code, start, end)
+    return int(np.count_nonzero(occupancy > np.asarray(capacity)[np.asarray(port_code)[event_row]]))
+
+def _interval_tree_build(start, end):
+    # Implicit augmented interval tree (tata letak cgranges): node = indeks array
+    # yang sudah urut start, level node = jumlah bit 1 di ujung indeks.
+    # max_end[i] = end terbesar di subtree node i. Return (max_end, level akar).
+    n = len(start)
+    max_end = np.asarray(end).copy()
+    if n == 0:
+        return max_end, -1
+    last_i = (n - 1) & ~1
+    last = max_end[last_i]
+    k = 1
+    while (1 << k) <= n:
+        x = 1 << (k - 1)
+        nodes = np.arange((x << 1) - 1, n, x << 2)
+        right = nodes + x
+        er = np.where(right < n, max_end[np.minimum(right, n - 1)], last)
+        max_end[nodes] = np.maximum(np.maximum(max_end[nodes], max_end[nodes - x]), er)
+        last_i = last_i - x if (last_i >> k) & 1 else last_i + x
+        if last_i < n and max_end[last_i] > last:
+            last = max_end[last_i]
+        k += 1
+    return max_end, k - 1
+
+class BerthIntervalIndex:
+    """
+    Index kunjungan per pelabuhan untuk query "kunjungan mana yang overlap
+    [t0, t1) di pelabuhan P" dalam O(log n + k).
+
+    Kunjungan disimpan terurut (pelabuhan, start); tiap pelabuhan punya
+    interval tree implisit sendiri di potongan array tersebut.
+    """
+    def __init__(self, port_code, start, end):
+        port_code = np.asarray(port_code, dtype=np.int64)
+        self.rows = np.lexsort((start, port_code))
+        self.start = np.asarray(start)[self.rows]
+        self.end = np.asarray(end)[self.rows]
+        num_ports = int(port_code.max()) + 1 if len(port_code) else 0
+        counts = np.bincount(port_code, minlength=num_ports)
+        self.offset = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.max_end = np.empty_like(self.end)
+        self.root_level = np.empty(num_ports, dtype=np.int64)
+        for p in range(num_ports):
+            lo, hi = self.offset[p], self.offset[p + 1]
+            self.max_end[lo:hi], self.root_level[p] = _interval_tree_build(self.start[lo:hi], self.end[lo:hi])
+
+    def overlap(self, port, t0, t1):
+        # Indeks kunjungan (baris data asli) dengan start < t1 dan end > t0, urut start
+        if port < 0 or port >= len(self.root_level) or self.root_level[port] < 0:
+            return np.empty(0, dtype=np.int64)
+        lo = self.offset[port]
+        n = self.offset[port + 1] - lo
+        start, end, max_end = self.start[lo:], self.end[lo:], self.max_end[lo:]
+        hits = []
+        stack = [(int((1 << self.root_level[port]) - 1), int(self.root_level[port]), False)]
+        while stack:
+            x, k, left_done = stack.pop()
+            if k <= 3:
+                # Subtree kecil: pindai linear
+                i0 = x >> k << k
+                i1 = min(i0 + (1 << (k + 1)) - 1, n)
+                i = i0
+                while i < i1 and start[i] < t1:
+                    if end[i] > t0:
+                        hits.append(i)
+                    i += 1
+            elif not left_done:
+                y = x - (1 << (k - 1))
+                stack.append((x, k, True))
+                if y >= n or max_end[y] > t0:
+                    stack.append((y, k - 1, False))
+            elif x < n and start[x] < t1:
+                if end[x] > t0:
+                    hits.append(x)
+                stack.append((x + (1 << (k - 1)), k - 1, False))
+        return self.rows[lo + np.asarray(hits, dtype=np.int64)]
+
+# ==========================================
+# WARM START: ATURAN DISPATCHING -> RANDOM KEY
+# ==========================================
+def _rank_keys(score):
+    # Skor kecil -> prioritas tinggi; peringkat dinormalisasi ke [0, 1]
+    rank = np.empty(len(score))
+    rank[np.argsort(score, kind='stable')] = np.arange(len(score))
+    return 1.0 - rank / max(len(score) - 1, 1)
+
+def previous_priority_keys(voyages, previous_schedule):
+    """
+    Random key dari Optimized_Priority run sebelumnya (optimized_schedule.csv).
+    Dicocokkan per (Ship_Name, Voyage_ID, Leg_Sequence); jika voyage berbeda
+    (bulan lain), dipakai rata-rata prioritas kapal tsb. di pelabuhan yang sama; sisanya 0.5.
+    """
+    keys = ['Ship_Name', 'Voyage_ID', 'Leg_Sequence']
+    exact = voyages[keys].merge(previous_schedule.drop_duplicates(keys)[keys + ['Optimized_Priority']],
+                                how='left', on=keys)['Optimized_Priority']
+    by_port = previous_schedule.groupby(['Ship_Name', 'Port_Name'])['Optimized_Priority'].mean()
+    fallback = voyages.join(by_port, on=['Ship_Name', 'Port_Name'])['Optimized_Priority']
+    return exact.fillna(fallback.reset_index(drop=True)).fillna(0.5).to_numpy(dtype=float)
+
+# ==========================================
+# INTERVAL SIBUK BAWAAN (STATE ANTAR BULAN)
+# ==========================================
+# File bulan saling tumpang tindih waktunya (voyage lintas bulan), jadi state
+# yang dibawa ke bulan berikutnya adalah interval sibuk sebenarnya, bukan waktu
+# kosong terakhir: kunjungan bulan M+1 hanya menunggu interval yang benar-benar
+# beririsan dengannya.
+#   {'berth_busy': {pelabuhan: [[mulai, selesai], ...]},
+#    'ship_busy':  {kapal: [[mulai, selesai], ...]}}   (jam sejak epoch)
+def carried_intervals(state):
+    # Normalisasi state; format lama {'berth_free', 'ship_ready'} = interval (-inf, t)
+    state = state or {}
+    berth_busy = {port: [list(iv) for iv in ivs] for port, ivs in state.get('berth_busy', {}).items()}
+    ship_busy = {ship: [list(iv) for iv in ivs] for ship, ivs in state.get('ship_busy', {}).items()}
+    for port, times in state.get('berth_free', {}).items():
+        berth_busy.setdefault(port, []).extend([-np.inf, t] for t in times if np.isfinite(t))
+    for ship, t in state.get('ship_ready', {}).items():
+        if np.isfinite(t):
+            ship_busy.setdefault(ship, []).append([-np.inf, t])
+    return {'berth_busy': berth_busy, 'ship_busy': ship_busy}
+
+def _csr(rows):
+    # list interval per baris -> (offset, start, end), tiap baris terurut menurut mulai
+    rows = [sorted(r) for r in rows]
+    offset = np.zeros(len(rows) + 1, dtype=np.int64)
+    offset[1:] = np.cumsum([len(r) for r in rows])
+    flat = [iv for r in rows for iv in r]
+    start = np.array([iv[0] for iv in flat], dtype=float)
+    end = np.array([iv[1] for iv in flat], dtype=float)
+    return offset, start, end
+
+def _no_blocks(num_berths, num_ships):
+    empty = np.empty(0)
+    return (np.zeros(num_berths + 1, dtype=np.int64), empty, empty,
+            np.zeros(num_ships + 1, dtype=np.int64), empty, empty)
+
+def busy_blocks(state, arrays, berth_offset, berth_count):
+    """
+    State antar bulan -> tuple CSR untuk kernel:
+    (berth_block_offset, berth_block_start, berth_block_end,
+     ship_block_offset, ship_block_start, ship_block_end).
+    Interval tiap pelabuhan dibagi ke slot berth secara greedy (slot yang paling
+    cepat kosong), sama seperti decoder membagi kunjungan.
+    """
+    carried = carried_intervals(state)
+    berth_rows = [[] for _ in range(int(berth_count.sum()))]
+    for p, name in enumerate(arrays['port_names']):
+        free = [(-np.inf, k) for k in range(berth_count[p])]
+        for start, end in sorted(carried['berth_busy'].get(name, [])):
+            free_at, k = heapq.heappop(free)
+            berth_rows[berth_offset[p] + k].append((start, end))
+            heapq.heappush(free, (max(free_at, end), k))
+    ship_rows = [carried['ship_busy'].get(name, []) for name in arrays['ship_names']]
+    return _csr(berth_rows) + _csr(ship_rows)
+
+# ==========================================
+# INSTANCE MASALAH (DIBANGUN SEKALI)
+# ==========================================
+class VoyageProblem:
+    """
+    Instance decoder prioritas untuk satu bulan data voyage.
+
+    Semua konversi (kode kapal/pelabuhan, waktu epoch, kapasitas berth,
+    urutan ETA, rantai leg per kapal) dihitung sekali di konstruktor;
+    evaluate() hanya menjalankan antrean + kernel. Objek ini tidak
+    menyimpan DataFrame sehingga murah di-pickle ke worker process pool.
+
+    initial_state: interval sibuk bulan sebelumnya (lihat final_state dan
+    carried_intervals); kunjungan hanya menunggu interval yang beririsan.
+    """
+    def __init__(self, voyages, caps, backend=None, initial_state=None):
+        self.arrays = voyage_arrays(voyages)
+        self.dim = len(voyages)
+        self.backend = resolve_backend(backend)
+        self.num_ships = len(self.arrays['ship_names'])
+
+        # Vektor kapasitas per kode pelabuhan + layout heap berth datar
+        self.berth_offset, self.berth_count = _berth_layout(self.arrays['port_names'], caps)
+        self.num_berths = int(self.berth_count.sum())
+
+        # Interval sibuk bawaan per berth & kapal (kosong jika tanpa initial_state)
+        self.initial_state = carried_intervals(initial_state)
+        self.blocks = busy_blocks(self.initial_state, self.arrays, self.berth_offset, self.berth_count)
+
+        # Urutan FCFS (ETA) -> baseline tanpa prioritas
+        self.eta_order = queue_order(self.arrays['eta_ns'])
+
+        # Rantai leg per kapal (Voyage_ID, Leg_Sequence): indeks leg berikutnya, -1 = tidak ada
+        chain = np.lexsort((voyages['Leg_Sequence'].to_numpy(),
+                            pd.factorize(voyages['Voyage_ID'], sort=True)[0],
+                            self.arrays['ship_code']))
+        same_ship = self.arrays['ship_code'][chain[1:]] == self.arrays['ship_code'][chain[:-1]]
+        self.next_leg = np.full(self.dim, -1, dtype=np.int64)
+        self.next_leg[chain[:-1][same_ship]] = chain[1:][same_ship]
+
+    @classmethod
+    def from_csv(cls, voyage_file, port_file, backend=None):
+        voyages = pd.read_csv(voyage_file)
+        voyages['ETA_Planned'] = pd.to_datetime(voyages['ETA_Planned'])
+        ports = pd.read_csv(port_file)
+        caps = dict(zip(ports['Nama_Pelabuhan'], ports['Total_Berths']))
+        return cls(voyages, caps, backend)
+
+    def _simulate(self, order):
+        return simulate_queue(self.arrays, None, order, self.backend,
+                              layout=(self.berth_offset, self.berth_count), blocks=self.blocks)
+
+    def evaluate(self, priority, return_detailed=False):
+        # Setara run_priority_simulation(voyages, caps, priority, return_detailed)
+        priority = np.asarray(priority, dtype=float)
+        queue_time = queue_times(self.arrays, priority)
+        order = queue_order(queue_time)
+        total_delay, actual_arrival, actual_berth = self._simulate(order)
+        if not return_detailed:
+            return total_delay
+        return _detailed_report(self.arrays, priority, queue_time, order, actual_arrival, actual_berth)
+
+    def evaluate_many(self, priority_matrix):
+        # Satu baris = satu solusi; return array total delay per baris
+        priority_matrix = np.atleast_2d(np.asarray(priority_matrix, dtype=float))
+        orders = queue_order(queue_times(self.arrays, priority_matrix)).astype(np.int64)
+        if self.backend == 'numba':
+            out = np.empty(len(orders))
+            _priority_rows_jit(orders, self.arrays['ship_code'], self.arrays['port_code'],
+                               self.arrays['eta'], self.arrays['service'],
+                               self.berth_offset, self.berth_count,
+                               self.num_berths, self.num_ships, self.blocks, out)
+            return out
+        return np.array([self._simulate(order)[0] for order in orders])
+
+    __call__ = evaluate_many
+
+    def final_state(self, priority):
+        """
+        State setelah jadwal `priority` selesai: interval sandar tiap berth
+        [sandar, berangkat) dan interval sibuk tiap kapal [tiba, berangkat),
+        ditambah interval initial_state yang selesai setelah ETA paling awal
+        bulan ini. Bisa disimpan sebagai JSON.
+        """
+        order = queue_order(queue_times(self.arrays, np.asarray(priority, dtype=float)))
+        _, actual_arrival, actual_berth = self._simulate(order)
+        departure = actual_berth + self.arrays['service']
+        horizon = self.arrays['eta'].min()
+        state = {key: {name: [iv for iv in ivs if iv[1] > horizon] for name, ivs in carried.items()}
+                 for key, carried in self.initial_state.items()}
+        ports = self.arrays['port_names'][self.arrays['port_code']]
+        ships = self.arrays['ship_names'][self.arrays['ship_code']]
+        for i in range(self.dim):
+            state['berth_busy'].setdefault(ports[i], []).append([float(actual_berth[i]), float(departure[i])])
+            state['ship_busy'].setdefault(ships[i], []).append([float(actual_arrival[i]), float(departure[i])])
+        return {key: {name: sorted(ivs) for name, ivs in carried.items() if ivs}
+                for key, carried in state.items()}
+
+    def rule_keys(self, rule):
+        """
+        Encode aturan dispatching sebagai vektor prioritas (random key):
+        fcfs        : semua 0.5 -> urutan ETA_Planned (baseline)
+        edd         : due date = ETA leg berikutnya - service (mulai paling lambat
+                      tanpa menunda leg berikutnya), due date kecil didahulukan
+        spt         : service time terpendek didahulukan
+        least_slack : slack = due date - ETA terkecil didahulukan
+        """
+        eta, service = self.arrays['eta'], self.arrays['service']
+        if rule == 'fcfs':
+            return np.full(self.dim, 0.5)
+        due = np.where(self.next_leg >= 0, eta[self.next_leg], np.inf) - service
+        if rule == 'edd':
+            return _rank_keys(due)
+        if rule == 'spt':
+            return _rank_keys(service)
+        if rule == 'least_slack':
+            return _rank_keys(due - eta)
+        raise ValueError(f"Aturan seed tidak dikenal: {rule}")
+
+    def seed_population(self, rules=SEED_RULES, previous=None):
+        # Matriks (k, dim) untuk argumen seeds CAOA; previous = hasil previous_priority_keys
+        seeds = [self.rule_keys(rule) for rule in rules]
+        if previous is not None:
+            seeds.append(np.asarray(previous, dtype=float))
+        return np.vstack(seeds)
+
+    def carried_overlap(self):
+        # Jumlah kunjungan ber-ETA sebelum interval bawaan terakhir di pelabuhannya,
+        # yaitu yang waktunya tumpang tindih dengan jadwal bulan sebelumnya
+        busy = self.initial_state['berth_busy']
+        last_end = np.array([max((iv[1] for iv in busy.get(name, [])), default=-np.inf)
+                             for name in self.arrays['port_names']])
+        return int(np.sum(self.arrays['eta'] < last_end[self.arrays['port_code']]))
+
+    def capacity_violations(self, priority):
+        # Cek jadwal hasil decode terhadap kapasitas berth (pengganti menjalankan
+        # conflict_detector.py pada CSV). Decoder selalu memakai berth yang paling
+        # cepat kosong, jadi nilai > 0 berarti ada bug di kernel, bukan solusi buruk.
+        order = queue_order(queue_times(self.arrays, np.asarray(priority, dtype=float)))
+        _, _, actual_berth = self._simulate(order)
+        return count_capacity_violations(self.arrays['port_code'], actual_berth,
+                                         actual_berth + self.arrays['service'], self.berth_count)
+
+    def baseline(self, return_detailed=False):
+        # FCFS murni: dilayani sesuai urutan ETA_Planned
+        total_delay, actual_arrival, actual_berth = self._simulate(self.eta_order)
+        if not return_detailed:
+            return total_delay
+        return _detailed_report(self.arrays, np.zeros(self.dim), self.arrays['eta_ns'],
+                                self.eta_order, actual_arrival, actual_berth)
+
+# ==========================================
+# KERNEL SIMULASI (PYTHON / JIT)
+# ==========================================
+def _priority_kernel(order, ship_code, port_code, eta, service,
+                     berth_free, berth_offset, berth_count, ship_ready,
+                     actual_arrival, actual_berth, blocks):
+    berth_block_offset, berth_block_start, berth_block_end = blocks[0], blocks[1], blocks[2]
+    ship_block_offset, ship_block_start, ship_block_end = blocks[3], blocks[4], blocks[5]
+    total_delay = 0.0
+    for k in range(len(order)):
+        i = order[k]
+        s = ship_code[i]
+        p = port_code[i]
+
+        # Kapal tidak bisa tiba selama masih sibuk di interval bawaan
+        arrival = _first_free(max(eta[i], ship_ready[s]), service[i], s,
+                              ship_block_offset, ship_block_start, ship_block_end)
+
+        start = berth_offset[p]
+        count = berth_count[p]
+        if berth_block_offset[start + count] == berth_block_offset[start]:
+            # Berth paling cepat kosong = akar min-heap pelabuhan p
+            berth = max(arrival, berth_free[start])
+            departure = berth + service[i]
+            _heap_replace_top(berth_free, start, count, departure)
+        else:
+            # Pelabuhan dengan interval bawaan: slot tidak lagi heap, pilih slot
+            # yang paling cepat bisa dipakai tanpa beririsan dengan interval bawaan
+            berth = np.inf
+            slot = start
+            for b in range(start, start + count):
+                t = _first_free(max(arrival, berth_free[b]), service[i], b,
+                                berth_block_offset, berth_block_start, berth_block_end)
+                if t < berth:
+                    berth = t
+                    slot = b
+            departure = berth + service[i]
+            berth_free[slot] = departure
+        ship_ready[s] = departure
+
+        actual_arrival[i] = arrival
+        actual_berth[i] = berth
+        total_delay += berth - eta[i]
+    return total_delay
+
+if NUMBA_AVAILABLE:
+    # cache=True: hasil kompilasi disimpan di __pycache__, tidak dikompilasi ulang tiap run
+    _priority_kernel_jit = _jit_with(_priority_kernel, _heap_replace_top=_heap_replace_top_jit,
+                                     _first_free=_first_free_jit)
+else:
+    _priority_kernel_jit = _priority_kernel
+
+def _priority_rows(orders, ship_code, port_code, eta, service,
+                   berth_offset, berth_count, num_berths, num_ships, blocks, out):
+    # Banyak solusi sekaligus: state di-reset per baris, buffer dipakai ulang
+    berth_free = np.empty(num_berths)
+    ship_ready = np.empty(num_ships)
+    actual_arrival = np.empty(orders.shape[1])
+    actual_berth = np.empty(orders.shape[1])
+    for r in range(orders.shape[0]):
+        berth_free[:] = -np.inf
+        ship_ready[:] = -np.inf
+        out[r] = _priority_kernel_jit(orders[r], ship_code, port_code, eta, service,
+                                      berth_free, berth_offset, berth_count, ship_ready,
+                                      actual_arrival, actual_berth, blocks)
+
+if NUMBA_AVAILABLE:
+    _priority_rows_jit = njit(cache=True)(_priority_rows)
+else:
+    _priority_rows_jit = _priority_rows
@@ -0,0 +1,241 @@
+import argparse
+import heapq
+import queue
+import threading
+import time
+import numpy as np
+
+from caoa_solver import VoyageProblem, SEED_RULES
+from CAOA import CAOA_iter
+from solve_months import DEFAULTS, SEED_DEFAULTS
+
+# Dash/Plotly opsional (requirements.txt); solver tetap bisa dipakai tanpa dashboard
+try:
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from dash import Dash, dcc, html, Input, Output, no_update
+    DASH_AVAILABLE = True
+except ImportError:
+    DASH_AVAILABLE = False
+
+# --- DASHBOARD LIVE CAOA ---
+# Solver (CAOA_iter) berjalan di thread terpisah dan mengirim snapshot ringan
+# ke queue berukuran tetap. Jika queue penuh, snapshot tertua dibuang, jadi
+# solver tidak pernah menunggu dashboard. Setiap interval Dash mengambil isi queue:
+#   - kurva konvergensi di-extend incremental (extendData), hanya titik saat best
+#     membaik + satu titik per `stride` iterasi. Titik perbaikan dicatat solver di
+#     log terpisah (maks. max_iter pasang angka) sehingga kurva tangga tetap eksak
+#     walau ada snapshot yang dibuang
+#   - Gantt berth pelabuhan terpilih dibangun ulang hanya jika best berubah,
+#     paling sering sekali per GANTT_MIN_INTERVAL detik
+
+MAX_CURVE_POINTS = 500
+GANTT_MIN_INTERVAL = 2.0 # detik
+
+def assign_berth_lanes(report):
+    # Nomor berth (lane Gantt) per kunjungan: urut waktu sandar, ambil berth yang
+    # paling cepat kosong (greedy interval partitioning per pelabuhan)
+    report = report.sort_values(['Port_Name', 'Actual_Berth']).reset_index(drop=True)
+    start = report['Actual_Berth'].to_numpy(dtype='int64')
+    end = report['Actual_Departure'].to_numpy(dtype='int64')
+    lanes = np.zeros(len(report), dtype=np.int64)
+    for rows in report.groupby('Port_Name', sort=False).indices.values():
+        free = [] # heap (waktu kosong, nomor berth)
+        for i in rows:
+            if free and free[0][0] <= start[i]:
+                _, lane = heapq.heappop(free)
+            else:
+                lane = len(free)
+            lanes[i] = lane
+            heapq.heappush(free, (end[i], lane))
+    report['Berth'] = [f"Berth {lane + 1}" for lane in lanes]
+    return report
+
+# ==========================================
+# SOLVER DI BACKGROUND THREAD
+# ==========================================
+class LiveRun:
+    def __init__(self, problem, config, seeds=None, seed=0, queue_size=256):
+        self.problem = problem
+        self.config = config
+        self.seeds = seeds
+        self.seed = seed
+        self.snapshots = queue.Queue(maxsize=queue_size)
+        self.stride = max(1, config['max_iter'] // MAX_CURVE_POINTS)
+        self.last = None          # snapshot terakhir yang sudah diambil dashboard
+        self.last_point = 0       # iterasi titik kurva terakhir
+        self.improvements = []    # log (iterasi, best) dari thread solver, tidak pernah dibuang
+        self.n_logged = 0         # jumlah entri log yang sudah digambar
+        self.best_pos = None
+        self.report = None        # laporan detail best_pos (dengan kolom Berth)
+        self.report_time = 0.0
+        self.report_stale = False
+        self.result = None
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._solve, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _publish(self, snap):
+        # Non-blocking: jika penuh, buang snapshot tertua. Snapshot berikutnya tetap
+        # membawa best & best_pos terbaru; titik perbaikannya ada di self.improvements
+        while True:
+            try:
+                self.snapshots.put_nowait(snap)
+                return
+            except queue.Full:
+                try:
+                    self.snapshots.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _solve(self):
+        config = self.config
+        np.random.seed(self.seed)
+        run = CAOA_iter(
+            N=config['pop_size'], max_iter=config['max_iter'], lb=0.0, ub=1.0, dim=self.problem.dim,
+            fobj=self.problem.evaluate, fobj_batch=self.problem.evaluate_many,
+            alpha=config['alpha'], beta=config['beta'], gamma=config['gamma'],
+            delta=config['delta'], initial_energy=config['initial_energy'], verbose=False,
+            seeds=self.seeds, seed_fraction=config['seed_fraction'] if self.seeds is not None else 0.0
+        )
+        try:
+            while True:
+                snap = next(run)
+                # Iterasi pertama (best awal) selalu dicatat: titik awal kurva tangga,
+                # walau snapshot-nya dibuang dan bukan perbaikan
+                if snap['improved'] or not self.improvements:
+                    self.improvements.append((snap['iter'], snap['best']))
+                self._publish(snap)
+        except StopIteration as stop:
+            self.result = stop.value
+        finally:
+            self.done.set()
+
+    def drain(self):
+        # Ambil semua snapshot yang menunggu -> titik kurva baru (xs, ys) urut iterasi
+        points = {}
+        while True:
+            try:
+                snap = self.snapshots.get_nowait()
+            except queue.Empty:
+                break
+            # Bandingkan referensi, bukan flag 'improved': perbaikan di snapshot yang
+            # dibuang tetap terlihat di snapshot berikutnya
+            if snap['best_pos'] is not self.best_pos:
+                self.best_pos = snap['best_pos']
+                self.report_stale = True
+            if self.last is None or snap['iter'] - self.last_point >= self.stride:
+                points[snap['iter']] = snap['best']
+                self.last_point = snap['iter']
+            self.last = snap
+
+        # Titik perbaikan dari log, sampai iterasi snapshot terakhir yang diterima
+        if self.last is not None:
+            while (self.n_logged < len(self.improvements)
+                   and self.improvements[self.n_logged][0] <= self.last['iter']):
+                it, best = self.improvements[self.n_logged]
+                points[it] = best
+                self.n_logged += 1
+        xs = sorted(points)
+        return xs, [points[x] for x in xs]
+
+    def refresh_report(self, force=False):
+        # Decode ulang best_pos ke jadwal berth (throttle); True jika laporan diperbarui
+        if self.best_pos is None or not self.report_stale:
+            return False
+        if not force and time.time() - self.report_time < GANTT_MIN_INTERVAL:
+            return False
+        self.report = assign_berth_lanes(self.problem.evaluate(self.best_pos, return_detailed=True))
+        self.report_time = time.time()
+        self.report_stale = False
+        return True
+
+# ==========================================
+# APLIKASI DASH
+# ==========================================
+def gantt_figure(report, port):
+    if report is None or port is None:
+        return go.Figure()
+    rows = report[report['Port_Name'] == port]
+    fig = px.timeline(rows, x_start='Actual_Berth', x_end='Actual_Departure', y='Berth',
+                      color='Delay_Hours', color_continuous_scale='Reds',
+                      hover_data=['Ship_Name', 'ETA_Planned', 'Waiting_Time_Hours'])
+    fig.update_yaxes(autorange="reversed", categoryorder='category ascending')
+    fig.update_layout(title=f"Jadwal Berth {port} (best saat ini)", xaxis_title="Waktu",
+                      yaxis_title="Berth", uirevision=port, height=450)
+    return fig
+
+def create_app(live, refresh_ms=1000):
+    if not DASH_AVAILABLE:
+        raise ImportError("Dashboard butuh dash dan plotly (lihat requirements.txt)")
+
+    # Pelabuhan diurutkan dari yang paling sibuk
+    port_names = live.problem.arrays['port_names']
+    visits = np.bincount(live.problem.arrays['port_code'], minlength=len(port_names))
+    ports = [str(port_names[p]) for p in np.argsort(-visits, kind='stable')]
+
+    curve = go.Figure(go.Scatter(x=[], y=[], mode='lines', line_shape='hv', name='Best Delay'))
+    curve.update_layout(title="Kurva Konvergensi", xaxis_title="Iterasi",
+                        yaxis_title="Total Delay (jam)", uirevision='curve', height=350)
+
+    app = Dash(__name__)
+    app.layout = html.Div([
+        html.H3("CAOA Live - Optimasi Prioritas Sandar"),
+        html.Div(id='status'),
+        dcc.Graph(id='curve', figure=curve),
+        dcc.Dropdown(id='port', options=ports, value=ports[0] if ports else None, clearable=False),
+        dcc.Graph(id='gantt'),
+        dcc.Store(id='gantt-version', data=0),
+        dcc.Interval(id='tick', interval=refresh_ms)
+    ])
+
+    @app.callback(Output('curve', 'extendData'), Output('status', 'children'),
+                  Output('gantt-version', 'data'), Output('tick', 'disabled'),
+                  Input('tick', 'n_intervals'))
+    def on_tick(_):
+        xs, ys = live.drain()
+        finished = live.done.is_set() and live.snapshots.empty()
+        refreshed = live.refresh_report(force=finished)
+        extend = (dict(x=[xs], y=[ys]), [0]) if xs else no_update
+
+        snap = live.last
+        if snap is None:
+            status = "Menunggu iterasi pertama..."
+        else:
+            status = (f"Iter {snap['iter']}/{live.config['max_iter']} | Best: {snap['best']:.2f} jam | "
+                      f"Depleted: {snap['n_depleted']} | Runtime: {snap['elapsed']:.1f} s")
+            if finished and live.result is not None:
+                status += f" | Selesai ({live.result[3]['stop_reason']})"
+        return extend, status, (time.time() if refreshed else no_update), finished
+
+    @app.callback(Output('gantt', 'figure'), Input('gantt-version', 'data'), Input('port', 'value'))
+    def on_gantt(_, port):
+        return gantt_figure(live.report, port)
+
+    return app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard live CAOA (kurva konvergensi + Gantt berth)")
+    parser.add_argument("--voyages", default="split_by_month/Voyage_Data_2025_01.csv")
+    parser.add_argument("--ports", default="Data/port_data.csv")
+    parser.add_argument("--backend", default=None, help="python atau numba (default: CAOA_BACKEND)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pop", type=int, default=DEFAULTS['pop_size'])
+    parser.add_argument("--iter", type=int, default=1000)
+    parser.add_argument("--seed-fraction", type=float, default=SEED_DEFAULTS['seed_fraction'],
+                        help="Porsi populasi awal dari aturan dispatching (0 = acak penuh)")
+    parser.add_argument("--queue-size", type=int, default=256, help="Kapasitas queue snapshot")
+    parser.add_argument("--refresh-ms", type=int, default=1000, help="Interval update dashboard")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=8050)
+    args = parser.parse_args()
+
+    problem = VoyageProblem.from_csv(args.voyages, args.ports, args.backend)
+    config = {**DEFAULTS, 'pop_size': args.pop, 'max_iter': args.iter, 'seed_fraction': args.seed_fraction}
+    seeds = problem.seed_population(SEED_RULES) if args.seed_fraction > 0 else None
+
+    live = LiveRun(problem, config, seeds=seeds, seed=args.seed, queue_size=args.queue_size).start()
+    create_app(live, args.refresh_ms).run(host=args.host, port=args.http_port, debug=False)
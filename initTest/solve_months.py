@@ -0,0 +1,297 @@
+import argparse
+import glob
+import json
+import multiprocessing as mp
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+
+from caoa_solver import VoyageProblem, SEED_RULES, previous_priority_keys
+from CAOA import CAOA, make_sink
+
+# --- DRIVER MULTI-BULAN ---
+# Setiap split_by_month/Voyage_Data_YYYY_MM.csv diselesaikan dengan CAOA
+# (decoder prioritas VoyageProblem) dan hasilnya ditulis ke
+# <out>/results_month_N seperti folder results_file yang dibuat manual.
+#   - mode independen: bulan-bulan dijalankan bersamaan di process pool
+#   - mode rolling   : bulan M+1 mulai dari state akhir bulan M (interval sibuk
+#                      tiap berth & kapal), jadi dijalankan berurutan dan pool
+#                      dipakai untuk evaluasi populasi.
+
+MONTH_FILE_RE = re.compile(r'Voyage_Data_(\d{4})_(\d{2})\.csv$')
+
+# Sama dengan pengaturan ParallelCAOA di pipeline.ipynb
+DEFAULTS = {'pop_size': 100, 'max_iter': 200, 'alpha': 0.3, 'beta': 0.2,
+            'gamma': 0.1, 'delta': 1e-4, 'initial_energy': 50.0}
+# Warm start: aturan dispatching + prioritas bulan sebelumnya ('previous')
+SEED_DEFAULTS = {'seed_rules': list(SEED_RULES) + ['previous'], 'seed_fraction': 0.2}
+# Berhenti dini (None = nonaktif); target_gain = % di bawah baseline FCFS
+STOP_DEFAULTS = {'time_budget': None, 'patience': None, 'rel_tol': None, 'window': 50, 'target_gain': None}
+# Trace instrumentasi per iterasi: None, 'jsonl', atau 'csv' (<out>/results_month_N/trace.*)
+TRACE_DEFAULTS = {'trace': None}
+
+def list_month_files(month_dir):
+    # [(label 'YYYY_MM', path), ...] urut kronologis
+    months = []
+    for path in glob.glob(os.path.join(month_dir, 'Voyage_Data_*.csv')):
+        match = MONTH_FILE_RE.search(os.path.basename(path))
+        if match:
+            months.append((f"{match.group(1)}_{match.group(2)}", path))
+    return sorted(months)
+
+def month_folder(label, years):
+    # results_month_7 (satu tahun) atau results_2026_month_7 (data lintas tahun)
+    year, month = label.split('_')
+    prefix = f"results_{year}_month" if len(years) > 1 else "results_month"
+    return f"{prefix}_{int(month)}"
+
+def load_capacity(port_file):
+    ports = pd.read_csv(port_file)
+    return dict(zip(ports['Nama_Pelabuhan'], ports['Total_Berths']))
+
+# ==========================================
+# EVALUASI POPULASI PARALEL (MODE ROLLING)
+# ==========================================
+_worker_problem = None
+
+def _init_worker(problem):
+    global _worker_problem
+    _worker_problem = problem
+
+def _eval_chunk(chunk):
+    return _worker_problem.evaluate_many(chunk)
+
+def _pool_batch(pool, workers):
+    def evaluate(population):
+        if len(population) == 0:
+            return np.empty(0)
+        chunks = np.array_split(population, min(workers, len(population)))
+        return np.concatenate(pool.map(_eval_chunk, chunks))
+    return evaluate
+
+# ==========================================
+# SATU BULAN
+# ==========================================
+def solve_month(task):
+    """
+    task: dict label, path, port_file, out_dir, config, seed, backend,
+    initial_state (opsional), workers (evaluasi paralel di dalam bulan),
+    previous_schedule (optimized_schedule.csv bulan sebelumnya, jika ada).
+    Return ringkasan + final_state untuk bulan berikutnya.
+    """
+    voyages = pd.read_csv(task['path'])
+    voyages['ETA_Planned'] = pd.to_datetime(voyages['ETA_Planned'])
+    problem = VoyageProblem(voyages, load_capacity(task['port_file']),
+                            task['backend'], task.get('initial_state'))
+    config = task['config']
+
+    # Seed heuristik; 'previous' hanya jika run_months memberi previous_schedule yang ada
+    seeds = None
+    rules = list(config['seed_rules'])
+    if config['seed_fraction'] > 0 and rules:
+        previous = None
+        prev_path = task.get('previous_schedule')
+        if 'previous' in rules and prev_path and os.path.exists(prev_path):
+            previous = previous_priority_keys(voyages, pd.read_csv(prev_path))
+        rules = [rule for rule in rules if rule != 'previous']
+        if rules or previous is not None:
+            seeds = problem.seed_population(rules, previous)
+
+    baseline = problem.baseline()
+    overlap = problem.carried_overlap()
+    if overlap:
+        # File bulan tumpang tindih waktunya: kunjungan ini bersaing dengan jadwal bulan
+        # sebelumnya yang sudah tetap, jadi delay-nya tidak sebanding dengan mode independen
+        print(f"[{task['label']}] PERINGATAN: {overlap} dari {problem.dim} kunjungan ber-ETA sebelum "
+              f"akhir jadwal bulan sebelumnya di pelabuhannya; kunjungan ini menunggu interval "
+              f"sandar bulan sebelumnya yang beririsan")
+    target = None
+    if config['target_gain'] is not None:
+        target = baseline * (1.0 - config['target_gain'] / 100.0)
+
+    os.makedirs(task['out_dir'], exist_ok=True)
+    trace = None
+    if config['trace']:
+        trace = make_sink(os.path.join(task['out_dir'], f"trace.{config['trace']}"))
+
+    start = time.time()
+    np.random.seed(task['seed'])
+    pool = None
+    fobj_batch = problem.evaluate_many
+    if task.get('workers', 1) > 1:
+        pool = mp.Pool(task['workers'], initializer=_init_worker, initargs=(problem,))
+        fobj_batch = _pool_batch(pool, task['workers'])
+    try:
+        best_score, best_prio, curve, info = CAOA(
+            N=config['pop_size'], max_iter=config['max_iter'], lb=0.0, ub=1.0, dim=problem.dim,
+            fobj=problem.evaluate, fobj_batch=fobj_batch,
+            alpha=config['alpha'], beta=config['beta'], gamma=config['gamma'],
+            delta=config['delta'], initial_energy=config['initial_energy'], verbose=False,
+            seeds=seeds, seed_fraction=config['seed_fraction'],
+            time_budget=config['time_budget'], patience=config['patience'],
+            rel_tol=config['rel_tol'], window=config['window'], target=target, return_info=True,
+            trace=trace
+        )
+    finally:
+        if trace is not None:
+            trace.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+    runtime = time.time() - start
+
+    # Tulis hasil dengan format yang sama seperti results_file/results_month_N
+    schedule = voyages.copy()
+    schedule['Optimized_Priority'] = best_prio
+    schedule.to_csv(os.path.join(task['out_dir'], 'optimized_schedule.csv'), index=False)
+    problem.baseline(return_detailed=True).to_csv(os.path.join(task['out_dir'], 'baseline.csv'), index=False)
+    problem.evaluate(best_prio, return_detailed=True).to_csv(
+        os.path.join(task['out_dir'], 'final_detailed_report.csv'), index=False)
+    np.savetxt(os.path.join(task['out_dir'], 'convergence.csv'), curve, delimiter=",",
+               header="best_delay", comments="")
+
+    final_state = problem.final_state(best_prio)
+    with open(os.path.join(task['out_dir'], 'final_state.json'), 'w') as f:
+        json.dump(final_state, f, indent=1)
+
+    return {
+        'month': task['label'], 'rows': problem.dim,
+        'baseline_delay': float(baseline), 'optimized_delay': float(best_score),
+        'time_saved': float(baseline - best_score),
+        'gain_pct': float((baseline - best_score) / baseline * 100) if baseline > 0 else 0.0,
+        'carried_ships': sum(name in problem.initial_state['ship_busy'] for name in problem.arrays['ship_names']),
+        'carried_overlap': overlap,
+        'n_seeds': 0 if seeds is None else len(seeds),
+        'iterations': info['iterations'], 'stop_reason': info['stop_reason'],
+        'runtime_s': runtime, 'final_state': final_state
+    }
+
+# ==========================================
+# SEMUA BULAN
+# ==========================================
+def run_months(month_dir, port_file, out_dir, rolling=False, workers=None,
+               seed=0, backend=None, initial_state=None, months=None, previous_dir=None,
+               **caoa_kwargs):
+    """
+    Selesaikan semua file bulan di month_dir. Return DataFrame ringkasan per bulan
+    (juga ditulis ke <out_dir>/months_summary.csv).
+
+    rolling=True : berurutan, state akhir bulan M menjadi initial_state bulan M+1
+                   (initial_state = state awal bulan pertama, mis. final_state.json).
+    rolling=False: bulan-bulan independen, dijalankan paralel di process pool.
+    previous_dir : folder run lain yang sudah selesai; sumber seed 'previous' untuk
+                   bulan yang tidak punya bulan sebelumnya di run rolling ini.
+    """
+    if not rolling and previous_dir and os.path.abspath(previous_dir) == os.path.abspath(out_dir):
+        raise ValueError("previous_dir tidak boleh sama dengan out_dir pada mode independen")
+    config = {**DEFAULTS, **SEED_DEFAULTS, **STOP_DEFAULTS, **TRACE_DEFAULTS, **caoa_kwargs}
+    files = list_month_files(month_dir)
+    all_labels = [label for label, _ in files]
+    if months:
+        files = [(label, path) for label, path in files if label in months]
+    if not files:
+        print(f"Tidak ada file Voyage_Data_YYYY_MM.csv di {month_dir}")
+        return pd.DataFrame()
+    years = {label.split('_')[0] for label, _ in files}
+    workers = workers or mp.cpu_count()
+
+    tasks = [{
+        'label': label, 'path': path, 'port_file': port_file,
+        'out_dir': os.path.join(out_dir, month_folder(label, years)),
+        'config': config, 'seed': seed + i, 'backend': backend
+    } for i, (label, path) in enumerate(files)]
+    # Seed 'previous' hanya dari hasil yang pasti sudah selesai ditulis: bulan sebelumnya
+    # di run ini (mode rolling, berurutan) atau previous_dir. Di mode independen bulan
+    # sebelumnya berjalan bersamaan, jadi file di out_dir belum ada / setengah tertulis.
+    all_years = {label.split('_')[0] for label in all_labels}
+    for i, task in enumerate(tasks):
+        if rolling and i > 0:
+            task['previous_schedule'] = os.path.join(tasks[i - 1]['out_dir'], 'optimized_schedule.csv')
+        elif previous_dir:
+            k = all_labels.index(task['label'])
+            if k > 0:
+                task['previous_schedule'] = os.path.join(
+                    previous_dir, month_folder(all_labels[k - 1], all_years), 'optimized_schedule.csv')
+
+    mode = 'rolling' if rolling else 'independen'
+    print(f"{len(tasks)} bulan | mode {mode} | {workers} proses")
+    start = time.time()
+    results = []
+
+    def report(res):
+        print(f"[{res['month']}] baris={res['rows']:<5} | baseline={res['baseline_delay']:,.2f} h | "
+              f"optimized={res['optimized_delay']:,.2f} h | gain={res['gain_pct']:.2f}% | "
+              f"iter={res['iterations']} ({res['stop_reason']}) | {res['runtime_s']:.1f}s")
+
+    if rolling:
+        state = initial_state
+        for task in tasks:
+            task['initial_state'] = state
+            task['workers'] = workers
+            res = solve_month(task)
+            state = res['final_state']
+            results.append(res)
+            report(res)
+    else:
+        with mp.Pool(min(workers, len(tasks))) as pool:
+            for res in pool.imap_unordered(solve_month, tasks):
+                results.append(res)
+                report(res)
+
+    summary = pd.DataFrame([{k: v for k, v in res.items() if k != 'final_state'} for res in results])
+    summary = summary.sort_values('month').reset_index(drop=True)
+    os.makedirs(out_dir, exist_ok=True)
+    summary.to_csv(os.path.join(out_dir, 'months_summary.csv'), index=False)
+    print(f"Selesai {len(tasks)} bulan dalam {time.time() - start:.1f}s -> {out_dir}/months_summary.csv")
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jalankan CAOA untuk semua file bulan sekaligus")
+    parser.add_argument("--months-dir", default="split_by_month")
+    parser.add_argument("--ports", default="Data/port_data.csv")
+    parser.add_argument("--out", default="results_file/batch")
+    parser.add_argument("--months", nargs='+', default=None, help="Subset label bulan, mis. 2025_01 2025_02")
+    parser.add_argument("--rolling", action="store_true",
+                        help="Bawa state kapal & berth dari bulan M ke bulan M+1 (berurutan)")
+    parser.add_argument("--initial-state", default=None, help="final_state.json sebagai state awal (mode rolling)")
+    parser.add_argument("--previous-dir", default=None,
+                        help="Folder --out run yang sudah selesai, sumber seed 'previous' di mode independen")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", default=None, help="python atau numba (default: CAOA_BACKEND)")
+    parser.add_argument("--pop", type=int, default=DEFAULTS['pop_size'])
+    parser.add_argument("--iter", type=int, default=DEFAULTS['max_iter'])
+    parser.add_argument("--alpha", type=float, default=DEFAULTS['alpha'])
+    parser.add_argument("--beta", type=float, default=DEFAULTS['beta'])
+    parser.add_argument("--gamma", type=float, default=DEFAULTS['gamma'])
+    parser.add_argument("--energy", type=float, default=DEFAULTS['initial_energy'])
+    parser.add_argument("--seed-rules", nargs='*', default=SEED_DEFAULTS['seed_rules'],
+                        choices=list(SEED_RULES) + ['previous'], help="Aturan warm start (kosong = tanpa seed)")
+    parser.add_argument("--seed-fraction", type=float, default=SEED_DEFAULTS['seed_fraction'],
+                        help="Fraksi populasi awal & respawn yang diambil dari seed")
+    parser.add_argument("--time-budget", type=float, default=None, help="Batas wall-clock per bulan (detik)")
+    parser.add_argument("--patience", type=int, default=None, help="Iterasi tanpa perbaikan sebelum berhenti")
+    parser.add_argument("--rel-tol", type=float, default=None,
+                        help="Berhenti jika perbaikan relatif selama --window iterasi di bawah nilai ini")
+    parser.add_argument("--window", type=int, default=STOP_DEFAULTS['window'])
+    parser.add_argument("--target-gain", type=float, default=None,
+                        help="Berhenti begitu delay X persen di bawah baseline FCFS")
+    parser.add_argument("--trace", choices=['jsonl', 'csv'], default=None,
+                        help="Tulis waktu per fase, jumlah evaluasi & statistik energi tiap iterasi")
+    args = parser.parse_args()
+
+    initial_state = None
+    if args.initial_state:
+        with open(args.initial_state) as f:
+            initial_state = json.load(f)
+
+    run_months(args.months_dir, args.ports, args.out, rolling=args.rolling, workers=args.workers,
+               seed=args.seed, backend=args.backend, initial_state=initial_state, months=args.months,
+               previous_dir=args.previous_dir,
+               pop_size=args.pop, max_iter=args.iter, alpha=args.alpha, beta=args.beta,
+               gamma=args.gamma, initial_energy=args.energy,
+               seed_rules=args.seed_rules, seed_fraction=args.seed_fraction,
+               time_budget=args.time_budget, patience=args.patience, rel_tol=args.rel_tol,
+               window=args.window, target_gain=args.target_gain, trace=args.trace)